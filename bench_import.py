@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时基准
+在全新子进程中测量 import main 以及各阶段实际需要的 SDK 的冷启动时间，
+并检查 import main 本身不会拉起任何重量级 SDK。
+
+用法:
+    python bench_import.py                # 每项跑 5 次取中位数
+    python bench_import.py --max-ms 300   # import main 超过阈值时退出码为 1，用于追踪回归
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+HEAVY_MODULES = ["requests", "feedparser", "markdown", "edge_tts", "dashscope", "aligo"]
+
+SCENARIOS = [
+    ("import main", "import main"),
+    ("采集阶段 (collection)", "import main, requests, feedparser"),
+    ("渲染阶段 (render)", "import main, markdown, edge_tts"),
+    ("全量 SDK (旧版启动)", "import main, " + ", ".join(HEAVY_MODULES)),
+]
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def time_import(stmt: str) -> float:
+    """在全新解释器中执行 stmt，返回耗时（毫秒），不含解释器自身启动时间"""
+    code = f"import time; t = time.perf_counter(); {stmt}; print((time.perf_counter() - t) * 1000)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def leaked_modules() -> list:
+    """import main 之后已被加载的重量级 SDK"""
+    code = f"import sys, main; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    return [m for m in result.stdout.strip().split(',') if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="J记财讯 启动耗时基准")
+    parser.add_argument("--runs", type=int, default=5, help="每项重复次数（取中位数）")
+    parser.add_argument("--max-ms", type=float, default=None, help="import main 的耗时上限（毫秒）")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"⏱️  启动耗时基准（{args.runs} 次中位数）")
+    print("=" * 60)
+
+    medians = {}
+    for name, stmt in SCENARIOS:
+        try:
+            samples = [time_import(stmt) for _ in range(args.runs)]
+        except subprocess.CalledProcessError as e:
+            print(f"  {name:<24} 跳过（{e.stderr.strip().splitlines()[-1] if e.stderr else '导入失败'}）")
+            continue
+        medians[name] = statistics.median(samples)
+        print(f"  {name:<24} {medians[name]:8.1f} ms")
+
+    ok = True
+    leaked = leaked_modules()
+    if leaked:
+        print(f"❌ import main 拉起了重量级 SDK: {', '.join(leaked)}")
+        ok = False
+    else:
+        print("✅ import main 未加载任何重量级 SDK")
+
+    if args.max_ms is not None and medians.get("import main", 0) > args.max_ms:
+        print(f"❌ import main 耗时 {medians['import main']:.1f} ms 超过上限 {args.max_ms:.0f} ms")
+        ok = False
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
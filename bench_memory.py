@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内存基准
+用 tracemalloc 对比两种"采集 → 评分 → 去重 → 取前 K 条"的峰值内存：
+  - 旧版：每条一个 dict，extend 成大列表 → 去重重建 dict → 全量排序 → 切片
+  - 流式：Item（__slots__ + 驻留 layer/source）逐条流过 score_item → TopK 有界堆
+并检查两者选出的条目等价（分数分布一致，分数线以上的标题一致；分数线上的同分条目允许不同，见 TopK），
+以及流式峰值不随总条数增长。
+另外把桩化的 fetch_single_feed（每个 feed 返回 --feed-entries 条）接到真实的 iter_live_items 上，
+检查线上采集路径的峰值同样不随信源数增长。
+
+用法:
+    python bench_memory.py                 # 10k / 100k 条合成情报 + 20 / 200 个信源
+    python bench_memory.py --sizes 100000 --k 300 --seeds 1,2,3 --feeds 20,400
+"""
+
+import sys
+import random
+import argparse
+import tracemalloc
+
+import main
+
+LAYERS = ["L1_Signal", "L2_Hot", "L3_Deep", "L4_Tech"]
+SOURCES = 200          # 模拟的信源数（来源名高度重复）
+DUP_RATE = 0.1         # 同标题重复报道的比例
+PROFILE = main.PROFILES['default']
+
+
+def synthetic_feed(n, seed=42):
+    """逐条生成合成情报字段，每次都新建字符串（与 feedparser 解析出的字符串一样互不共享）"""
+    rng = random.Random(seed)
+    keywords = main.KW_HIGH_VALUE + main.KW_LOW_VALUE
+    for i in range(n):
+        story = rng.randrange(int(n * DUP_RATE)) if rng.random() < DUP_RATE else n + i
+        title = f"第 {story} 号新闻：{rng.choice(keywords)} {rng.choice(keywords)}"
+        yield {
+            "layer": rng.choice(LAYERS),
+            "title": title,
+            "summary": f"{title} 的摘要，" + "详细内容" * rng.randint(20, 60),
+            "score": 0,
+            "weight": rng.randint(1, 4),
+            "source": "来源-" + str(rng.randrange(SOURCES)),
+            "link": f"https://example.com/{i}",
+            "published": "2026-08-01 06:00:00",
+        }
+
+
+def legacy_pipeline(n, k, seed):
+    """旧版：列表 + dict 去重 + 全量排序"""
+    all_news = []
+    for record in synthetic_feed(n, seed):
+        all_news.append(record)
+    scored = []
+    for item in all_news:
+        score = main.calculate_score(item['title'], item['summary'], item['weight'],
+                                     PROFILE['kw_high'], PROFILE['kw_low'])
+        if score >= 3:
+            scored.append({**item, "score": score})
+    seen = {}
+    for item in scored:
+        title = item['title'].strip().lower()
+        if title not in seen or item['score'] > seen[title]['score']:
+            seen[title] = item
+    scored = list(seen.values())
+    scored.sort(key=lambda x: x['score'], reverse=True)
+    return [(item['title'], item['score']) for item in scored[:k]]
+
+
+def streaming_pipeline(n, k, seed):
+    """流式：生成器 + Item + TopK"""
+    items = (main.Item(**record) for record in synthetic_feed(n, seed))
+    top = main.TopK(k)
+    for item in items:
+        scored = main.score_item(item, PROFILE)
+        if scored is not None:
+            top.push(scored)
+    return [(item.title, item.score) for item in top.result()]
+
+
+def equivalent(legacy, streaming):
+    """分数序列相同，且严格高于第 K 名分数线的标题集合相同"""
+    if [s for _, s in legacy] != [s for _, s in streaming]:
+        return False
+    if not legacy:
+        return True
+    cutoff = legacy[-1][1]
+    return {t for t, s in legacy if s > cutoff} == {t for t, s in streaming if s > cutoff}
+
+
+class _StubScheduler:
+    def __contains__(self, url):
+        return False
+
+    def save(self):
+        pass
+
+
+def live_pipeline(feeds, k, entries):
+    """真实的 iter_live_items → score_item → TopK，只把网络抓取换成合成数据"""
+    def fetch(url, layer_name, base_weight, max_entries=8, observe=None, min_score=3):
+        seed = int(url.rsplit('/', 1)[1])
+        return [main.Item(**record) for record in synthetic_feed(entries, seed)]
+
+    main.fetch_single_feed = fetch
+    main.get_opml_scheduler = _StubScheduler
+    main.get_rss_layers = lambda: {"L3_Deep": {"urls": [f"https://feed.example.com/{i}" for i in range(feeds)],
+                                               "weight": 2}}
+    top = main.TopK(k)
+    for item in main.iter_live_items():
+        scored = main.score_item(item, PROFILE)
+        if scored is not None:
+            top.push(scored)
+    return [(item.title, item.score) for item in top.result()]
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    selected = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, selected
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="J记财讯 内存基准")
+    parser.add_argument("--sizes", default="10000,100000", help="逗号分隔的条目总数")
+    parser.add_argument("--k", type=int, default=main.CLUSTER_POOL, help="保留的 Top-K 条数")
+    parser.add_argument("--seeds", default="42,1,2,3,4",
+                        help="逗号分隔的随机种子：第一个用于测内存，其余只在最小规模上校验结果等价")
+    parser.add_argument("--feeds", default="20,200", help="逗号分隔的信源数（线上采集路径）")
+    parser.add_argument("--feed-entries", type=int, default=500, help="每个信源返回的条目数")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(',')]
+    seeds = [int(s) for s in args.seeds.split(',')]
+
+    print("=" * 60)
+    print(f"🧠 内存基准（K = {args.k}，tracemalloc 峰值）")
+    print("=" * 60)
+    print(f"  {'条目数':>8}  {'旧版 (MB)':>10}  {'流式 (MB)':>10}  {'比值':>6}")
+
+    ok = True
+    streaming_peaks = []
+    for n in sizes:
+        legacy_mb, legacy_selected = measure(legacy_pipeline, n, args.k, seeds[0])
+        streaming_mb, streaming_selected = measure(streaming_pipeline, n, args.k, seeds[0])
+        streaming_peaks.append(streaming_mb)
+        print(f"  {n:>8}  {legacy_mb:>10.2f}  {streaming_mb:>10.2f}  {legacy_mb / streaming_mb:>5.1f}x")
+        if not equivalent(legacy_selected, streaming_selected):
+            print(f"❌ {n} 条时两种流水线选出的 Top-{args.k} 不等价（seed={seeds[0]}）")
+            ok = False
+
+    for seed in seeds[1:]:
+        n = min(sizes)
+        if not equivalent(legacy_pipeline(n, args.k, seed), streaming_pipeline(n, args.k, seed)):
+            print(f"❌ {n} 条时两种流水线选出的 Top-{args.k} 不等价（seed={seed}）")
+            ok = False
+
+    # 条目数翻了 10 倍，流式峰值应基本不变（只取决于 K）
+    if len(streaming_peaks) > 1 and max(streaming_peaks) > 2 * min(streaming_peaks):
+        print("❌ 流式峰值内存随条目总数增长")
+        ok = False
+
+    print(f"  {'信源数':>8}  {'总条目':>10}  {'线上路径 (MB)':>14}")
+    live_peaks = []
+    for feeds in [int(s) for s in args.feeds.split(',')]:
+        live_mb, _ = measure(live_pipeline, feeds, args.k, args.feed_entries)
+        live_peaks.append(live_mb)
+        print(f"  {feeds:>8}  {feeds * args.feed_entries:>10}  {live_mb:>14.2f}")
+    if len(live_peaks) > 1 and max(live_peaks) > 2 * min(live_peaks):
+        print("❌ 线上采集路径 (iter_live_items) 的峰值内存随信源数增长")
+        ok = False
+
+    if ok:
+        print(f"✅ 结果等价（{len(seeds)} 个种子），流式与线上采集路径的峰值只取决于 K")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main_cli()
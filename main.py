@@ -5,85 +5,210 @@ import time
 import glob
 import logging
 import asyncio
+import math
+import json
+import heapq
 import random
-import requests
-import feedparser
-import markdown
+import sqlite3
+import argparse
+import gzip
+import zlib
+import calendar
+import hashlib
+import threading
+import contextlib
+import functools
+import itertools
 import concurrent.futures
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 from http import HTTPStatus
-import edge_tts
-import dashscope # 阿里云百炼 SDK
-from dashscope import Generation, MultiModalConversation
-from aligo import Aligo
+from urllib.parse import urlsplit, unquote
+from email.utils import formatdate, parsedate_to_datetime
+# ⚠️ 重量级 SDK (requests/feedparser/markdown/edge_tts/dashscope/aligo) 一律在用到的阶段内再导入：
+# 只 import main 取 calculate_score 等工具函数、或只跑采集/渲染时，不必为用不到的 SDK 付启动时间。
 
 # ── 模型重试配置 ──────────────────────────────────────────
 MAX_RETRIES = 3          # 最大重试次数
 RETRY_BASE_DELAY = 2     # 指数退避基数（秒）：第1次等2s，第2次等4s
+MODEL_MAX_CONCURRENCY = 2  # 全局模型并发上限（多版本/回填并行时共享）
+MODEL_MIN_INTERVAL = 1.0   # 相邻两次模型调用的最小间隔（秒）
 # ─────────────────────────────────────────────────────────
 
 # ================= 0. 全局配置 =================
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    datefmt='%H:%M:%S'
-)
+# 导入本模块不产生副作用：日志在入口处 setup_logging() 配置，环境变量在用到时读取
 logger = logging.getLogger("J-Intel")
 
-# 🟢 1. 打印 SDK 版本 (用于调试环境确保支持 Kimi 思考模式)
-try:
-    logger.info(f"🔍 当前 DashScope SDK 版本: {dashscope.__version__}")
-except:
-    pass
+def setup_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        datefmt='%H:%M:%S'
+    )
 
 # 🟢 核心：强制锁定北京时间 (UTC+8)
-utc_now = datetime.utcnow()
-BEIJING_NOW = utc_now + timedelta(hours=8)
+# 运行日期 run_date 是流水线参数（北京时间 datetime），晨跑取当前时间，回填取历史日期
+def beijing_now():
+    return datetime.utcnow() + timedelta(hours=8)
 
-DATE_STR = BEIJING_NOW.strftime('%Y%m%d')
-DISPLAY_DATE = BEIJING_NOW.strftime('%Y年%m月%d日')
 WEEK_DAYS = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
-DISPLAY_WEEKDAY = WEEK_DAYS[BEIJING_NOW.weekday()]
 
-# 环境变量
-DASHSCOPE_API_KEY = os.getenv('DASHSCOPE_API_KEY') # 阿里云 Key (通用)
-BARK_KEY = os.getenv('BARK_KEY')
-ALIYUN_TOKEN = os.getenv('ALIYUN_REFRESH_TOKEN')
-GITHUB_REPO = os.getenv('GITHUB_REPOSITORY', 'My-Daily-AI-Report')
+# 环境变量：DASHSCOPE_API_KEY (阿里云 Key，通用) / BARK_KEY / ALIYUN_REFRESH_TOKEN / GITHUB_REPOSITORY
+#           PUBLIC_BASE_URL (自托管 serve 模式的对外地址，如 https://brief.example.com；设置后 feed 和推送链接指向它)
+def github_repo():
+    return os.getenv('GITHUB_REPOSITORY', 'My-Daily-AI-Report')
 
 # 输出路径
 OUTPUT_DIR = 'output'
-AUDIO_FILE = f'{OUTPUT_DIR}/briefing_{DATE_STR}.mp3'
-MD_FILE = f'{OUTPUT_DIR}/briefing_{DATE_STR}.md'
-HTML_FILE = f'{OUTPUT_DIR}/briefing_{DATE_STR}.html'
+BACKFILL_DIR = 'backfill'       # 回填产物目录：不进 git、不受 cleanup_outputs 的 3 天清理影响
 RSS_FILE = 'feed.xml'
+ARCHIVE_DIR = 'data/archive'   # 原始素材 + LLM 输出归档，回填 (backfill) 的数据来源
+ARCHIVE_RETENTION_DAYS = 30     # 仓库里只保留最近 30 天归档，完整历史上传到云盘 ALIYUN_ARCHIVE_FOLDER
+ALIYUN_FOLDER = '/晨间情报'
+ALIYUN_ARCHIVE_FOLDER = '/晨间情报/归档'  # 回填更早的日期时，从这里把归档文件放回 data/archive
+
+# 常驻采集 (ingest 模式) 的本地情报库
+ITEM_STORE = 'data/items.db'
+ITEM_STORE_MAX_AGE = 30 * 60        # 情报库心跳超过 30 分钟视为过期，晨跑回退到实时采集
+ITEM_RETENTION_HOURS = 72           # 情报库保留 72 小时
+LAYER_REFRESH_SECONDS = 3600        # ingest 模式下每小时重建一次信源表（轮换 OPML 博客）
+DEFAULT_POLL_INTERVAL = 1800
+INGEST_RETRY_DELAY = 30             # ingest 某一轮出错（如库被锁）后等待多久重试
+
+# 多版本并行生成（采集只做一次，各版本的评分/LLM/TTS 并行）
+PROFILE_CONCURRENCY = 2     # 同时生成的版本数上限（受 LLM 接口并发限制）
+
+# OPML 博客调度
+OPML_FILE = 'hn_popular_blogs_2025.opml'
+OPML_STATE_FILE = 'data/opml_state.json'  # 调度状态随 git add . 一起提交，跨次运行持久化
+OPML_BUDGET = 5             # 每次运行抓取的博客数
+OPML_COVERAGE_DAYS = 14     # 保证每个博客至少 N 天内被抓一次
+OPML_DORMANT_DAYS = 60      # 超过该天数没有新文章的博客，优先级逐步衰减
 
 # ================= 1. 信源分层策略 (升级版) =================
 
-def load_opml_sources(file_path='hn_popular_blogs_2025.opml'):
+_OPML_CACHE = {}  # file_path -> (mtime, sources)，OPML 未改动时不重复解析
+
+def load_opml_sources(file_path=OPML_FILE):
     sources = []
     if os.path.exists(file_path):
+        mtime = os.path.getmtime(file_path)
+        cached = _OPML_CACHE.get(file_path)
+        if cached and cached[0] == mtime:
+            return list(cached[1])
         try:
             tree = ET.parse(file_path)
             root = tree.getroot()
             for outline in root.findall(".//outline[@type='rss']"):
                 url = outline.get('xmlUrl')
                 if url: sources.append(url)
+            _OPML_CACHE[file_path] = (mtime, list(sources))
             logger.info(f"📂 已加载 OPML 深度源: {len(sources)} 个")
         except Exception as e:
             logger.error(f"❌ OPML 解析失败: {e}")
     return sources
 
+class OpmlScheduler:
+    """
+    OPML 博客轮询调度器（替代 random.sample）。
+    - 覆盖保证：每次运行预留 ceil(总数 / OPML_COVERAGE_DAYS) 个名额给最久未抓的博客（轮转），
+      只要每天至少运行一次，每个博客 N 天内必被抓到。
+    - 新鲜度优先：剩余名额按"自上次抓取以来出现新文章的概率"加权抽取，
+      概率由观测到的发文频率（EWMA，篇/天）和距上次新文章的时间估算。
+    """
+
+    def __init__(self, sources, state_file=OPML_STATE_FILE):
+        self.state_file = state_file
+        self.lock = threading.Lock()
+        saved = {}
+        if os.path.exists(state_file):
+            try:
+                with open(state_file, encoding='utf-8') as f:
+                    saved = json.load(f).get('feeds', {})
+            except Exception as e:
+                logger.warning(f"⚠️ 读取 OPML 调度状态失败（将重建）: {e}")
+        # OPML 中已删除的博客随之丢弃
+        self.feeds = {url: saved.get(url, {}) for url in sources}
+
+    def __contains__(self, url):
+        return url in self.feeds
+
+    def _priority(self, state, now):
+        if not state.get('last_polled'):
+            return 1.0
+        rate = state.get('rate', 0.2)
+        elapsed_days = (now - state['last_polled']) / 86400
+        p_new = 1 - math.exp(-rate * elapsed_days)
+        idle_days = (now - state.get('last_new', state['last_polled'])) / 86400
+        activity = math.exp(-idle_days / OPML_DORMANT_DAYS)
+        return max(p_new * (0.5 + 0.5 * activity), 1e-6)
+
+    def pick(self, budget=OPML_BUDGET):
+        now = time.time()
+        urls = list(self.feeds)
+        if len(urls) <= budget:
+            return urls
+
+        reserved = min(budget, math.ceil(len(urls) / OPML_COVERAGE_DAYS))
+        if reserved == budget:
+            logger.warning(f"⚠️ OPML 共 {len(urls)} 个源，每次 {budget} 个只够轮转，无法按新鲜度加权")
+        # 1. 轮转名额：最久未抓（从未抓过的排最前）
+        urls.sort(key=lambda u: self.feeds[u].get('last_polled', 0))
+        picked = urls[:reserved]
+        # 2. 加权名额：Efraimidis-Spirakis 加权无放回抽样
+        rest = urls[reserved:]
+        keys = {u: random.random() ** (1 / self._priority(self.feeds[u], now)) for u in rest}
+        picked += sorted(rest, key=keys.get, reverse=True)[:budget - reserved]
+        return picked
+
+    def observe(self, url, pub_times):
+        """记录一次抓取：pub_times 为 feed 中所有条目的发布时间戳（抓取失败传空列表）"""
+        now = time.time()
+        with self.lock:
+            state = self.feeds.setdefault(url, {})
+            latest = state.get('latest', 0)
+            new_times = [t for t in pub_times if t > latest]
+            if 'rate' not in state:
+                # 首次抓取：用 feed 自带的历史条目估计发文频率
+                span_days = (now - min(pub_times)) / 86400 if pub_times else 0
+                state['rate'] = len(pub_times) / span_days if span_days > 1 else 0.2
+            else:
+                elapsed_days = max((now - state['last_polled']) / 86400, 1 / 24)
+                state['rate'] = 0.7 * state['rate'] + 0.3 * len(new_times) / elapsed_days
+            if new_times:
+                state['latest'] = max(new_times)
+                state['last_new'] = now
+            state['last_polled'] = now
+
+    def save(self):
+        with self.lock:
+            data = json.dumps({'feeds': self.feeds}, ensure_ascii=False, indent=1)
+        os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+        tmp = self.state_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp, self.state_file)
+
+_OPML_SCHEDULER = None
+
+def get_opml_scheduler():
+    """OPML 未改动时复用同一个调度器（ingest 模式每小时重建信源表）"""
+    global _OPML_SCHEDULER
+    sources = load_opml_sources()
+    if _OPML_SCHEDULER is None or set(_OPML_SCHEDULER.feeds) != set(sources):
+        _OPML_SCHEDULER = OpmlScheduler(sources)
+    return _OPML_SCHEDULER
+
 def get_rss_layers():
-    # 从 80+ 个博客中随机抽取 5 个作为今日深度补充
-    opml_blogs = load_opml_sources()
-    selected_blogs = random.sample(opml_blogs, min(5, len(opml_blogs))) if opml_blogs else []
+    # 从 OPML 博客中按"轮转 + 新鲜度"调度抽取今日深度补充
+    selected_blogs = get_opml_scheduler().pick(OPML_BUDGET)
 
     return {
         # 🟢 L1: 市场信号 (快讯/电报) - 权重最高，捕捉异动
         "L1_Signal": {
             "weight": 2, 
+            "interval": 300,   # 电报类高频滚动，5 分钟一轮
             "urls": [
                 "https://rsshub.rssforever.com/wallstreetcn/live/global/2", # 华尔街见闻-快讯
                 "https://rsshub.rssforever.com/cls/telegraph/red",         # 财联社-电报
@@ -93,6 +218,7 @@ def get_rss_layers():
         # 🟢 L2: 行业热点 (头条/热榜) - 关注主流叙事
         "L2_Hot": {
             "weight": 2, 
+            "interval": 900,
             "urls": [
                 "https://rsshub.rssforever.com/wallstreetcn/hot/day",      # 华尔街见闻-日榜
                 "https://rsshub.rssforever.com/yicai/headline",            # 第一财经-头条
@@ -102,7 +228,8 @@ def get_rss_layers():
         # 🟢 L3: 深度思考 (博客/深度媒) - 寻找长逻辑
         "L3_Deep": {
             "weight": 2,
-            "urls": selected_blogs + [                                     # OPML 随机源
+            "interval": 3600,
+            "urls": selected_blogs + [                                     # OPML 调度源
                 "https://rsshub.app/huxiu/channel/103",                    # 虎嗅-深案例
                 "https://rsshub.rssforever.com/eastmoney/report/strategyreport" # 券商策略
             ]
@@ -110,6 +237,7 @@ def get_rss_layers():
         # 🟢 L4: 硬核技术 (Tech/Dev) - 寻找工具铲子
         "L4_Tech": {
             "weight": 2,
+            "interval": 1800,
             "urls": [
                 "https://news.ycombinator.com/rss",                        # Hacker News
                 "https://rsshub.app/github/trending/daily/python",         # GitHub Trending
@@ -123,13 +251,26 @@ def get_rss_layers():
 KW_HIGH_VALUE = ["融资", "财报", "暴涨", "暴跌", "政策", "首发", "独家", "SaaS", "变现", "套利", "红利", "风口", "底层逻辑", "架构", "开源", "复盘"]
 KW_LOW_VALUE = ["促销", "抽奖", "八卦", "预告", "开箱", "体验", "游戏", "电影", "综艺", "明星"]
 
-def calculate_score(title, summary, base_weight):
+@functools.lru_cache(maxsize=None)
+def _keyword_matcher(kw):
+    """
+    词表可写原始大小写（如 "GPU"、"SaaS"），匹配时统一小写。
+    纯 ASCII 词按英文单词边界匹配（允许复数 s），否则 "AI" 会命中 said/again/email；
+    边界只看 ASCII 字母数字，"AI芯片" 这类中英混排照样命中。中文词仍按子串匹配。
+    """
+    kw = kw.lower()
+    if not kw.isascii():
+        return lambda content: kw in content
+    pattern = re.compile(rf'(?<![a-z0-9]){re.escape(kw)}s?(?![a-z0-9])')
+    return lambda content: pattern.search(content) is not None
+
+def calculate_score(title, summary, base_weight, kw_high=KW_HIGH_VALUE, kw_low=KW_LOW_VALUE):
     score = base_weight
     content = (title + summary).lower()
-    for kw in KW_HIGH_VALUE:
-        if kw in content: score += 1
-    for kw in KW_LOW_VALUE:
-        if kw in content: score -= 2
+    for kw in kw_high:
+        if _keyword_matcher(kw)(content): score += 1
+    for kw in kw_low:
+        if _keyword_matcher(kw)(content): score -= 2
     return max(1, min(5, score))
 
 def clean_text_for_tts(text: str) -> str:
@@ -144,20 +285,69 @@ def clean_text_for_tts(text: str) -> str:
     return text.strip()
 
 # ================= 3. 并行采集引擎 =================
+# 采集 → 评分 → 去重 → Top-K 全程是生成器流水线：条目逐条流过，只有 Top-K 堆常驻内存，
+# 峰值内存取决于 K 而不是采集总条数（见 bench_memory.py）。
+
+_NAMES = {}  # 驻留过的层级/来源名：持有引用，避免名字随条目释放后反复进出解释器的驻留表
+
+def intern_name(name):
+    interned = _NAMES.get(name)
+    if interned is None:
+        interned = _NAMES[name] = sys.intern(name)
+    return interned
+
+@dataclass(slots=True)
+class Item:
+    """单条情报。layer/source 取值有限且高度重复，驻留 (intern) 后所有条目共享同一个字符串对象"""
+    layer: str
+    title: str
+    summary: str
+    score: int
+    source: str
+    link: str = ''
+    published: str = ''
+    weight: int = 2
+    heat: int = 1
+    content: str = ''
+
+    def __post_init__(self):
+        self.layer = intern_name(self.layer)
+        self.source = intern_name(self.source)
+
+    @property
+    def title_key(self):
+        return self.title.strip().lower()
+
+    def to_record(self):
+        """归档用的原始字段（不含 heat/content 这类下游附加信息）"""
+        return {"layer": self.layer, "title": self.title, "summary": self.summary, "score": self.score,
+                "source": self.source, "link": self.link, "published": self.published, "weight": self.weight}
+
+def fetch_single_feed(url, layer_name, base_weight, max_entries=8, observe=None, min_score=3):
+    """
+    max_entries=None 时读取整个 feed（ingest 模式用，避免高频源的条目被挤出前 8 条）。
+    observe(url, pub_times)：抓取后回调 feed 全部条目的发布时间戳，供 OPML 调度器估计发文频率。
+    min_score=0 时保留全部条目，留给各版本用自己的词表重新评分（见 score_item）。
+    """
+    import requests
+    import feedparser
 
-def fetch_single_feed(url, layer_name, base_weight):
     headers = {'User-Agent': 'Mozilla/5.0 (J-Intel/3.0)'}
     items = []
+    pub_times = []
     try:
         resp = requests.get(url, headers=headers, timeout=10)
         feed = feedparser.parse(resp.content)
-        cutoff_time = BEIJING_NOW - timedelta(hours=24)
+        now = beijing_now()  # 每次调用现算，常驻进程里不能用启动时的时间
+        cutoff_time = now - timedelta(hours=24)
+        source = feed.feed.get('title', 'Unknown')
         
-        for entry in feed.entries[:8]: 
-            pub_time = BEIJING_NOW
+        for entry in feed.entries[:max_entries]: 
+            pub_time = now
             if hasattr(entry, 'published_parsed') and entry.published_parsed:
                 try:
                     pub_time = datetime(*entry.published_parsed[:6]) + timedelta(hours=8)
+                    pub_times.append(calendar.timegm(entry.published_parsed))
                 except: pass
             
             if pub_time > cutoff_time:
@@ -165,57 +355,479 @@ def fetch_single_feed(url, layer_name, base_weight):
                 summary = entry.get('summary', '')[:300]
                 score = calculate_score(title, summary, base_weight)
                 
-                if score >= 3:
-                    items.append({
-                        "layer": layer_name,
-                        "title": title,
-                        "summary": summary,
-                        "score": score,
-                        "source": feed.feed.get('title', 'Unknown')
-                    })
+                if score >= min_score:
+                    items.append(Item(
+                        layer=layer_name,
+                        title=title,
+                        summary=summary,
+                        score=score,
+                        weight=base_weight,
+                        source=source,
+                        link=entry.get('link', ''),
+                        published=pub_time.strftime('%Y-%m-%d %H:%M:%S')
+                    ))
     except Exception as e:
         logger.warning(f"⚠️ 采集失败 [{layer_name}] {url[:60]}: {e}")
+    if observe:
+        observe(url, pub_times)
     return items
 
-def _dedup_items(items):
-    """按标题去重，同标题保留分数最高的那条（借鉴 Intel Briefing）"""
-    seen = {}
-    for item in items:
-        title = item.get('title', '').strip().lower()
-        if not title:
-            continue
-        if title not in seen or item['score'] > seen[title]['score']:
-            seen[title] = item
-    return list(seen.values())
+class TopK:
+    """
+    有界最小堆：按标题去重（借鉴 Intel Briefing，同标题保留分数最高的那条），只保留分数最高的 k 条。
+    同分按标题首次到达的顺序排列，堆满时淘汰分数最低、到达最晚的。
+    与"全量去重 + 稳定排序 + 切片"相比，选出条目的分数分布完全一致；差别只在于已被淘汰的标题
+    （堆里不再记着它）以更高分重新出现时按重新出现的时间排序，因此卡在第 k 名分数线上的同分条目
+    可能换成另一条。要做到逐条一致，需要为所有见过的标题记住到达顺序，内存就回到 O(总条数) 了。
+    """
 
-def fetch_all_data():
+    def __init__(self, k):
+        self.k = k
+        self._heap = []    # (score, -seq, title_key, item)
+        self._index = {}   # title_key -> 堆中条目
+        self._seq = 0
+        self.seen = 0      # 推入的条数
+        self.dropped = 0   # 被同标题更高分条目顶掉的重复条数
+
+    def push(self, item):
+        key = item.title_key
+        if not key:
+            return
+        self.seen += 1
+        self._seq += 1
+        order = -self._seq
+        existing = self._index.get(key)
+        if existing is not None:
+            self.dropped += 1
+            if item.score <= existing[0]:
+                return
+            order = existing[1]  # 同标题换成高分条目时沿用首次到达的顺序
+            self._heap.remove(existing)  # 重复标题很少且 k 很小，O(k) 删除可以接受
+            heapq.heapify(self._heap)
+        elif len(self._heap) >= self.k:
+            if item.score <= self._heap[0][0]:
+                return
+            del self._index[heapq.heappop(self._heap)[2]]
+        entry = (item.score, order, key, item)
+        heapq.heappush(self._heap, entry)
+        self._index[key] = entry
+
+    def extend(self, items):
+        for item in items:
+            self.push(item)
+        return self
+
+    def result(self):
+        """按分数降序（同分按到达顺序）返回保留的条目"""
+        return [entry[3] for entry in sorted(self._heap, key=lambda e: (-e[0], -e[1]))]
+
+def iter_live_items(workers=10):
+    """
+    实时采集：各 feed 抓完即逐条产出，不汇总成大列表。
+    最多 2×workers 个 feed 在途（抓取中或已抓完待消费），结果消费完立即释放，
+    峰值内存与信源总数无关。
+    """
     logger.info("🚀 启动全层级情报扫描...")
     layers = get_rss_layers()
-    all_news = []
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        futures = []
-        for layer_name, config in layers.items():
-            for url in config['urls']:
-                futures.append(executor.submit(fetch_single_feed, url, layer_name, config['weight']))
-        
-        for future in concurrent.futures.as_completed(futures):
-            all_news.extend(future.result())
+    scheduler = get_opml_scheduler()
+    feeds = ((url, layer_name, config['weight'])
+             for layer_name, config in layers.items() for url in config['urls'])
+    total = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+
+        def submit(n):
+            for url, layer_name, weight in itertools.islice(feeds, n):
+                observe = scheduler.observe if url in scheduler else None
+                pending.add(executor.submit(fetch_single_feed, url, layer_name, weight,
+                                            observe=observe, min_score=0))
+
+        submit(2 * workers)
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            while done:
+                future = done.pop()  # 从 done/pending 中移除后，这批条目消费完即可回收
+                pending.discard(future)
+                items = future.result()
+                total += len(items)
+                yield from items
+            submit(2 * workers - len(pending))
+    scheduler.save()
+    logger.info(f"✅ 采集完成，共 {total} 条原始情报")
+
+def collect_items(store=ITEM_STORE):
+    """
+    共享采集：所有版本共用一次采集（或常驻采集库），逐条产出未经阈值过滤的原始条目，
+    评分/过滤/去重交给各版本的 score_item + TopK。
+    """
+    window = load_store_window(store)
+    if window is not None:
+        logger.info(f"✅ 使用常驻采集库 {store}：读取过去 24 小时情报")
+        return window
+    return iter_live_items()
+
+def score_item(item, profile):
+    """按版本配置筛选层级、用版本词表重新评分；低于 3 分或层级不符返回 None"""
+    layers = profile.get('layers')
+    if layers and item.layer not in layers:
+        return None
+    score = calculate_score(item.title, item.summary, item.weight, profile['kw_high'], profile['kw_low'])
+    if score < 3:
+        return None
+    return item if score == item.score else replace(item, score=score)
+
+def score_items(items, profile, k=None):
+    """流式评分 + 去重 + Top-K：返回该版本分数最高的 k 条（降序，默认 CLUSTER_POOL）"""
+    top = TopK(k or CLUSTER_POOL)
+    for item in items:
+        scored = score_item(item, profile)
+        if scored is not None:
+            top.push(scored)
+    return _finish_top_k(top, profile)
+
+def _finish_top_k(top, profile):
+    if top.dropped:
+        logger.info(f"🔍 [{profile['name']}] 去重：移除 {top.dropped} 条重复")
+    selected = top.result()
+    logger.info(f"✅ [{profile['name']}] {top.seen} 条合格情报，保留前 {len(selected)} 条")
+    return selected
 
-    before = len(all_news)
-    all_news = _dedup_items(all_news)
-    after = len(all_news)
-    if before > after:
-        logger.info(f"🔍 去重：{before} → {after} 条（移除 {before - after} 条重复）")
+def fetch_all_data():
+    return score_items(collect_items(), PROFILES['default'])
+
+# ================= 3.5 常驻采集 (Ingest Daemon) =================
+# 采集从 06:30 的关键路径上拆出来：常驻进程按各层 interval 轮询入库（入库即评分+去重），
+# 晨跑只需从本地库读取现成的 24 小时窗口。
+
+def open_item_store(path=ITEM_STORE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")  # 晨跑读取窗口时不阻塞常驻进程写入
+    conn.execute("""CREATE TABLE IF NOT EXISTS items (
+        title_key TEXT PRIMARY KEY,
+        layer TEXT, title TEXT, summary TEXT, source TEXT, link TEXT,
+        score INTEGER, published TEXT, ingested REAL, weight INTEGER DEFAULT 2)""")
+    try:
+        conn.execute("ALTER TABLE items ADD COLUMN weight INTEGER DEFAULT 2")  # 兼容旧库
+    except sqlite3.OperationalError:
+        pass
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_items_published ON items(published)")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
 
-    all_news.sort(key=lambda x: x['score'], reverse=True)
-    logger.info(f"✅ 采集完成，筛选出 {len(all_news)} 条高价值情报")
-    return all_news
+def store_items(conn, items):
+    """
+    入库去重：与 TopK 同一规则，同标题只保留分数最高的那条，首次发布时间不变。
+    入库不设分数阈值，各版本读取时用自己的词表重新评分。
+    """
+    now = time.time()
+    rows = []
+    for item in items:
+        title_key = item.title_key
+        if title_key:
+            rows.append((title_key, item.layer, item.title, item.summary, item.source,
+                         item.link, item.score, item.published, now, item.weight))
+    with conn:
+        before = conn.total_changes
+        conn.executemany("""INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(title_key) DO UPDATE SET
+                layer=excluded.layer, summary=excluded.summary, source=excluded.source,
+                link=excluded.link, score=excluded.score
+            WHERE excluded.score > items.score""", rows)
+        return conn.total_changes - before
+
+def prune_item_store(conn, hours=ITEM_RETENTION_HOURS):
+    cutoff = (beijing_now() - timedelta(hours=hours)).strftime('%Y-%m-%d %H:%M:%S')
+    with conn:
+        conn.execute("DELETE FROM items WHERE published < ?", (cutoff,))
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_ingest', ?)", (str(time.time()),))
+
+def _iter_store_rows(conn, rows):
+    try:
+        for row in rows:  # 游标逐行读取，不一次性 fetchall
+            yield Item(*row)
+    except sqlite3.Error as e:
+        # 读到一半出错也回退到实时采集；已产出的条目与实时结果同标题的会在 TopK 里去重
+        logger.warning(f"⚠️ 读取常驻采集库中断，回退到实时采集: {e}")
+        yield from iter_live_items()
+    finally:
+        conn.close()
+
+def load_store_window(path=ITEM_STORE, hours=24):
+    """逐条读取情报库中过去 N 小时的条目（已去重、按分数降序）；库不存在、心跳过期或读取失败返回 None"""
+    if not os.path.exists(path):
+        return None
+    conn = None
+    try:
+        conn = sqlite3.connect(path, timeout=30)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_ingest'").fetchone()
+        if not row or time.time() - float(row[0]) > ITEM_STORE_MAX_AGE:
+            conn.close()
+            logger.warning("⚠️ 常驻采集库已过期，回退到实时采集")
+            return None
+        cutoff = (beijing_now() - timedelta(hours=hours)).strftime('%Y-%m-%d %H:%M:%S')
+        # 查询在这里执行（拿到首行），出错走下面的回退；库由 ingest 以 WAL 模式创建，读游标不阻塞写入
+        rows = conn.execute("""SELECT layer, title, summary, score, source, link, published, weight
+            FROM items WHERE published > ? ORDER BY score DESC, published DESC""", (cutoff,))
+    except Exception as e:
+        if conn is not None:
+            conn.close()
+        logger.warning(f"⚠️ 读取常驻采集库失败，回退到实时采集: {e}")
+        return None
+    return _iter_store_rows(conn, rows)
+
+def run_ingest_daemon(path=ITEM_STORE, once=False):
+    logger.info(f"🛰️ 常驻采集启动，情报库: {path}")
+    conn = open_item_store(path)
+    next_due = {}
+    layers, layers_built = None, 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        while True:
+            # 单轮出错（库被锁、磁盘满、OPML 状态写入失败……）只记日志稍后重试，不让常驻进程退出；
+            # 本轮没入库的源 next_due 未更新，下一轮会重新抓取
+            try:
+                if layers is None or time.time() - layers_built > LAYER_REFRESH_SECONDS:
+                    layers, layers_built = get_rss_layers(), time.time()
+                scheduler = get_opml_scheduler()
+
+                futures = {}
+                for layer_name, config in layers.items():
+                    for url in config['urls']:
+                        if next_due.get(url, 0) <= time.time():
+                            observe = scheduler.observe if url in scheduler else None
+                            future = executor.submit(fetch_single_feed, url, layer_name, config['weight'], None, observe, 0)
+                            futures[future] = (url, config.get('interval', DEFAULT_POLL_INTERVAL))
+
+                added = 0
+                for future in concurrent.futures.as_completed(futures):
+                    url, interval = futures[future]
+                    added += store_items(conn, future.result())
+                    next_due[url] = time.time() + interval
+                prune_item_store(conn)
+                if futures:
+                    scheduler.save()
+                    logger.info(f"📥 本轮轮询 {len(futures)} 个源，新增/更新 {added} 条")
+            except Exception as e:
+                if once:
+                    raise
+                logger.error(f"❌ 本轮采集失败，{INGEST_RETRY_DELAY} 秒后重试: {e}")
+                time.sleep(INGEST_RETRY_DELAY)
+                continue
+
+            if once:
+                break
+            wait = min(next_due.values(), default=time.time() + DEFAULT_POLL_INTERVAL) - time.time()
+            time.sleep(max(1, min(wait, 60)))
+    conn.close()
+
+# ================= 3.6 话题聚类 (Topic Clustering) =================
+# 送进 LLM 之前先在本地把同一话题的报道聚成一簇，每簇只挑最有代表性的几条（附带簇大小作为"热度"），
+# 话题归并和来源多样性在本地完成，Qwen 的 token 只花在写作上。
+
+CLUSTER_POOL = 300            # 参与聚类的候选条数（按分数取前 N）
+CLUSTER_HASH_DIM = 2 ** 12    # 哈希特征维度
+CLUSTER_SIM_THRESHOLD = 0.35  # 余弦相似度阈值，超过即视为同一话题
+CLUSTER_MAX_REPS = 2          # 每个话题最多送入的代表条数
+CONTEXT_MAX_ITEMS = 80        # 送入 Stage 1 的素材上限
+SOURCE_MAX_SHARE = 0.5        # 单一来源在素材中的占比上限
+
+def _char_ngrams(text, n_range=(2, 3)):
+    text = re.sub(r'<[^>]+>', '', text).lower()
+    text = re.sub(r'\s+', ' ', text)
+    for n in n_range:
+        for i in range(len(text) - n + 1):
+            yield text[i:i + n]
+
+def vectorize_items(items, dim=CLUSTER_HASH_DIM):
+    """字符 n-gram 哈希 TF-IDF 向量（L2 归一化），返回 N×dim 的 float32 矩阵"""
+    import numpy as np
+
+    tf = np.zeros((len(items), dim), dtype=np.float32)
+    for row, item in enumerate(items):
+        text = f"{item.title} {item.summary[:80]}"
+        for gram in _char_ngrams(text):
+            tf[row, zlib.crc32(gram.encode('utf-8')) % dim] += 1  # crc32 跨进程稳定，不受 hash 随机化影响
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((1 + len(items)) / (1 + df)) + 1
+    vectors = np.log1p(tf) * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-9)
+
+def cluster_items(items, threshold=CLUSTER_SIM_THRESHOLD):
+    """
+    Leader 聚类：按分数从高到低，每个尚未归簇的条目作为新簇的首条，
+    吸收所有与它相似度超过阈值的未归簇条目。items 需已按分数降序。
+    """
+    import numpy as np
+
+    vectors = vectorize_items(items)
+    sims = vectors @ vectors.T
+    unassigned = np.ones(len(items), dtype=bool)
+    index = np.arange(len(items))
+    clusters = []
+    for leader in range(len(items)):
+        if not unassigned[leader]:
+            continue
+        # leader 总是在自己的簇里：没有可向量化文字的条目（如标题只有 "<br/>"）向量全零，和自己的相似度也是 0
+        members = np.flatnonzero(unassigned & ((sims[leader] >= threshold) | (index == leader)))
+        unassigned[members] = False
+        clusters.append([items[i] for i in members])  # flatnonzero 升序，首条即 leader
+    return clusters
+
+def select_representatives(news_items, max_items=CONTEXT_MAX_ITEMS):
+    """聚类后按话题轮流挑选代表条目，并限制单一来源占比；每条附带 heat（所在话题的报道条数）"""
+    pool = news_items[:CLUSTER_POOL]
+    try:
+        clusters = cluster_items(pool)
+    except ImportError:
+        logger.warning("⚠️ 未安装 numpy，跳过话题聚类，按分数直接取前 80 条")
+        return [replace(item, heat=1) for item in news_items[:max_items]]
+
+    # 热门话题优先：首条分数高者在前，同分时报道多者在前
+    clusters.sort(key=lambda c: (c[0].score, len(c)), reverse=True)
+    target = min(max_items, sum(min(len(c), CLUSTER_MAX_REPS) for c in clusters))
+    source_cap = max(1, math.ceil(target * SOURCE_MAX_SHARE))
+    source_count = {}
+    picked = [[] for _ in clusters]
+    selected = []
+
+    for _ in range(CLUSTER_MAX_REPS):
+        for ci, cluster in enumerate(clusters):
+            if len(selected) >= max_items:
+                break
+            if len(picked[ci]) >= min(len(cluster), CLUSTER_MAX_REPS):
+                continue
+            # 簇内按分数顺序找第一个未选、且来源未超限的条目（同话题优先换一个来源）
+            chosen_sources = {item.source for item in picked[ci]}
+            candidates = [item for item in cluster if all(item is not p for p in picked[ci])]
+            candidates.sort(key=lambda item: item.source in chosen_sources)
+            for item in candidates:
+                if source_count.get(item.source, 0) < source_cap:
+                    picked[ci].append(item)
+                    source_count[item.source] = source_count.get(item.source, 0) + 1
+                    selected.append(replace(item, heat=len(cluster)))
+                    break
+
+    logger.info(f"🧩 话题聚类：{len(pool)} 条 → {len(clusters)} 个话题，送入 {len(selected)} 条代表")
+    return selected
+
+# ================= 3.7 正文补全 (Enrichment) =================
+# 只给最终入选的少数条目抓取原文正文（RSS 摘要往往只有一两句），
+# 有界并发 + 按域名复用连接 + 本地缓存 + 整体截止时间，超时的条目退回摘要，采集耗时不随总条数增长。
+
+CONTENT_CACHE = 'data/content_cache.db'
+ENRICH_TOP_N = 12          # 只补全分数最高的前 N 条代表
+ENRICH_WORKERS = 8         # 总并发
+ENRICH_PER_HOST = 2        # 同一域名的并发/连接上限
+ENRICH_DEADLINE = 20       # 整个补全阶段的截止时间（秒）
+ENRICH_MAX_CHARS = 1000    # 每条正文送入 LLM 的字数上限
+
+_SESSIONS = {}             # host -> (requests.Session, threading.Semaphore)
+_SESSIONS_LOCK = threading.Lock()
+
+def _host_session(host):
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _SESSIONS_LOCK:
+        if host not in _SESSIONS:
+            session = requests.Session()
+            session.headers['User-Agent'] = 'Mozilla/5.0 (J-Intel/3.0)'
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=ENRICH_PER_HOST)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _SESSIONS[host] = (session, threading.Semaphore(ENRICH_PER_HOST))
+        return _SESSIONS[host]
+
+def extract_main_text(html_bytes):
+    """正文抽取：去掉脚本/导航等噪音后，取直接包含段落文字最多的那个容器"""
+    import lxml.html
+
+    doc = lxml.html.fromstring(html_bytes)
+    for bad in doc.xpath('//script|//style|//noscript|//nav|//header|//footer|//aside|//form'):
+        bad.drop_tree()
+    best, best_len = None, 0
+    for container in {p.getparent() for p in doc.iter('p') if p.getparent() is not None}:
+        length = sum(len(p.text_content().strip()) for p in container.findall('p'))
+        if length > best_len:
+            best, best_len = container, length
+    if best is None:
+        return ""
+    paragraphs = [p.text_content().strip() for p in best.findall('p')]
+    return "\n".join(p for p in paragraphs if p)
+
+def _fetch_article(url, deadline):
+    host = urlsplit(url).netloc
+    session, slot = _host_session(host)
+    with slot:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            return ""
+        resp = session.get(url, timeout=min(10, timeout))
+        resp.raise_for_status()
+        return extract_main_text(resp.content)
+
+def _open_content_cache(path=CONTENT_CACHE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS content (url TEXT PRIMARY KEY, text TEXT, fetched REAL)")
+    return conn
+
+def enrich_items(items, top_n=ENRICH_TOP_N, deadline=ENRICH_DEADLINE):
+    """为分数最高的 top_n 条补全正文（写入 item.content），其余条目和超时条目保持摘要"""
+    targets = sorted((i for i, item in enumerate(items) if item.link),
+                     key=lambda i: items[i].score, reverse=True)[:top_n]
+    if not targets:
+        return items
+
+    conn = _open_content_cache()
+    urls = {items[i].link for i in targets}
+    cached = {}
+    for url in urls:
+        row = conn.execute("SELECT text FROM content WHERE url = ?", (url,)).fetchone()
+        if row:
+            cached[url] = row[0]
+    missing = [url for url in urls if url not in cached]
+
+    fetched = {}
+    if missing:
+        end = time.monotonic() + deadline
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=ENRICH_WORKERS)
+        futures = {executor.submit(_fetch_article, url, end): url for url in missing}
+        done, not_done = concurrent.futures.wait(futures, timeout=deadline)
+        executor.shutdown(wait=False, cancel_futures=True)  # 不等超时的请求，直接退回摘要
+        for future in done:
+            url = futures[future]
+            try:
+                text = future.result()
+            except Exception as e:
+                logger.debug(f"正文抓取失败 {url[:60]}: {e}")
+                continue
+            if text:
+                fetched[url] = text
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO content VALUES (?, ?, ?)",
+                             [(url, text, time.time()) for url, text in fetched.items()])
+        if not_done:
+            logger.warning(f"⚠️ 正文补全超时：{len(not_done)} 条退回摘要")
+    conn.close()
+
+    contents = {**cached, **fetched}
+    enriched = list(items)
+    for i in targets:
+        text = contents.get(items[i].link)
+        if text:
+            enriched[i] = replace(items[i], content=text[:ENRICH_MAX_CHARS])
+    logger.info(f"📖 正文补全：{len(targets)} 条候选，缓存命中 {len(cached)}，新抓取 {len(fetched)}")
+    return enriched
 
 # ================= 4. 双模型流水线 (阿里云 All-in-One) =================
 
 # --- Stage 1: Qwen3-Max (结构师 + 猎手) ---
-QWEN_PROMPT = f"""
+# 模板占位符 {display_date} / {display_weekday} 在调用时按版本和日期填充
+QWEN_PROMPT = """
 # Role: "J记财讯" 首席情报架构师
 
 ## Task
@@ -225,12 +837,13 @@ QWEN_PROMPT = f"""
 * **筛选标准**：高商业价值、技术突破、政策剧变、巨头动向。
 * **数量**：精选20条。
 * **来源要求**：**请尽可能选择不同的媒体来源，不要让单一媒体（如36氪、华尔街见闻）占据超过50%的内容。**
+* **热度参考**：素材已按话题聚类，每条标注的"热"是同一话题的报道条数，热度越高说明越多媒体在跟进；同一话题只写一条。
 * **格式**：每条控制在200字以内。
 * **内容结构**：
     - **【领域标签】** 总结原新闻内容（客观陈述，1-2句话）+ AI模型分析（搞钱指向，1-2句话）
     - **（消息来源：XX+日期）**
 * **风格要求**：
-    - **开头固定格式**：**今天是{DISPLAY_DATE}，{DISPLAY_WEEKDAY}，一起了解过去24小时新闻。**
+    - **开头固定格式**：**今天是{display_date}，{display_weekday}，一起了解过去24小时新闻。**
     - 前半部分：客观总结原新闻，不掺杂分析
     - 后半部分：AI模型基于事实的冷峻分析，必须带**搞钱指向**——谁受影响 + 该做什么
     - 时效词：内测/刚刚/紧急/48小时内/窗口期/首当其冲
@@ -244,7 +857,7 @@ QWEN_PROMPT = f"""
 
 ### Part 1: 全球热点速递 (Top 20)
 (请按以下范例格式输出 20 条)
-**今天是{DISPLAY_DATE}，{DISPLAY_WEEKDAY}，一起了解过去24小时新闻。**
+**今天是{display_date}，{display_weekday}，一起了解过去24小时新闻。**
 
 > 【AI】OpenAI官方博客2月14日发布，GPT-5已进入灰度测试阶段，新增视频生成功能。该技术将降低影视内容制作门槛，传统外包报价模式承压。短视频剪辑师、影视外包公司首当其冲，需48小时内评估技能升级路径或转向创意策划层，避免被工具替代。（消息来源：OpenAI官方博客2月14日）
 
@@ -322,6 +935,171 @@ KIMI_PROMPT = """
 - 本周：选一个功能做成Demo，找3个老客户测试"不用打开APP，直接语音调用"
 """
 
+# --- English edition prompts ---
+QWEN_PROMPT_EN = """
+# Role: Chief Intelligence Architect of "J-Intel Daily"
+
+## Task
+You are the first stage of the pipeline. Using today's raw material (mostly Chinese sources), do two things, writing everything in English:
+
+### Task 1: Part 1 (Top 20)
+* **Selection**: high business value, technical breakthroughs, policy shifts, moves by big players.
+* **Count**: pick 20 items, from as many different outlets as possible (no single outlet over 50%).
+* **Heat**: the material is pre-clustered by topic; "热" on each item is how many reports cover that topic. Higher heat means wider coverage. Write at most one item per topic.
+* **Per item** (under 80 words): **[Sector tag]** an objective 1-2 sentence summary, then a 1-2 sentence analysis of who is affected and what to do about it, ending with **(Source: outlet + date)**.
+* **Opening line**: **Today is {display_weekday}, {display_date}. Here is what happened in the last 24 hours.**
+
+### Task 2: Part 2 (Deep Dive Draft)
+* Pick the 1-3 topics with the clearest money-making angle and list raw analysis notes (what happened, the logic, red/blue ocean call, concrete actions). Do not write the final article.
+
+## Output Format (strict)
+Separate the two parts with "===SPLIT===".
+
+### Part 1: Global Briefing (Top 20)
+**Today is {display_weekday}, {display_date}. Here is what happened in the last 24 hours.**
+
+===SPLIT===
+
+### Part 2 Draft
+"""
+
+KIMI_PROMPT_EN = """
+# Role: Senior Columnist of "J-Intel Daily"
+
+## Task
+Rewrite the architect's Deep Dive draft into the final **Part 2: Deep Dive**, in plain, punchy English.
+
+For each topic use a headline of the form "Opportunity: <specific angle>", then three sections:
+1. **What actually happened**: one expert call in a single phrase, then 2-3 sentences in plain words about what it means and where the money comes from.
+2. **Who wins, who loses**: red or blue ocean, the moat, and whether entering now is smart or suicidal.
+3. **How to make money**: a staged plan (cold start, moat, scale) with concrete steps.
+
+Avoid jargon and filler phrases. End with **Next Step**: three concrete actions for tonight, tomorrow morning and this week.
+"""
+
+# ================= 4.5 多版本配置 (Profiles) =================
+# 每个版本有自己的层级、词表、提示词、音色和输出路径；采集只做一次，各版本共享。
+WEEK_DAYS_EN = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+_ZH_PROFILE = {
+    "title": "J记财讯",
+    "layers": None,                      # None = 全部层级
+    "kw_high": KW_HIGH_VALUE,
+    "kw_low": KW_LOW_VALUE,
+    "qwen_prompt": QWEN_PROMPT,
+    "kimi_prompt": KIMI_PROMPT,
+    "part2_heading": "Part 2: 深度搞钱逻辑 (Deep Dive)",
+    "date_format": '%Y年%m月%d日',
+    "weekdays": WEEK_DAYS,
+    "intro": "今天是{display_date}，{display_weekday}。欢迎收听{title}。\n\n",
+    "masthead": "🦁 {title} · 商业内参",
+    "audio_label": "🎧 语音播报：",
+    "notify_body": "今日商业情报已生成(Qwen+Kimi)，点击查看详情。",
+    "feed_description": "每日商业情报内参",
+    "episode_title": "{display_date} 情报内参",
+    "episode_description": "{title}每日更新 · {display_weekday}",
+    "voice": "zh-CN-YunxiNeural",
+    "lang": "zh-CN",
+}
+
+PROFILES = {
+    # 主版本：输出路径与 feed.xml 保持不变
+    "default": {**_ZH_PROFILE, "name": "default", "prefix": "briefing", "rss_file": RSS_FILE},
+    "tech": {
+        **_ZH_PROFILE,
+        "name": "tech",
+        "title": "J记财讯·科技版",
+        "layers": ["L3_Deep", "L4_Tech"],
+        "kw_high": ["开源", "架构", "模型", "芯片", "Agent", "SaaS", "发布", "框架", "算力", "GPU", "LLM", "AI"],
+        "prefix": "briefing_tech",
+        "rss_file": "feed_tech.xml",
+    },
+    "finance": {
+        **_ZH_PROFILE,
+        "name": "finance",
+        "title": "J记财讯·财经版",
+        "layers": ["L1_Signal", "L2_Hot", "L3_Deep"],
+        "kw_high": ["融资", "财报", "暴涨", "暴跌", "政策", "央行", "降息", "加息", "IPO", "并购", "回购", "利率", "汇率", "套利"],
+        "prefix": "briefing_finance",
+        "rss_file": "feed_finance.xml",
+    },
+    "en": {
+        **_ZH_PROFILE,
+        "name": "en",
+        "title": "J-Intel Daily",
+        "qwen_prompt": QWEN_PROMPT_EN,
+        "kimi_prompt": KIMI_PROMPT_EN,
+        "part2_heading": "Part 2: Deep Dive",
+        "date_format": '%B %d, %Y',
+        "weekdays": WEEK_DAYS_EN,
+        "intro": "Today is {display_weekday}, {display_date}. Welcome to {title}.\n\n",
+        "masthead": "🦁 {title} · Business Briefing",
+        "audio_label": "🎧 Listen: ",
+        "notify_body": "Today's business briefing is ready (Qwen+Kimi). Tap to read.",
+        "feed_description": "Daily business intelligence briefing",
+        "episode_title": "{display_date} Briefing",
+        "episode_description": "{title} daily update · {display_weekday}",
+        "voice": "en-US-AndrewNeural",
+        "lang": "en",
+        "prefix": "briefing_en",
+        "rss_file": "feed_en.xml",
+    },
+}
+
+def profile_dates(profile, run_date):
+    return run_date.strftime(profile['date_format']), profile['weekdays'][run_date.weekday()]
+
+def profile_paths(profile, run_date, out_dir=OUTPUT_DIR):
+    base = f"{profile['prefix']}_{run_date.strftime('%Y%m%d')}"
+    return {
+        "md": f'{out_dir}/{base}.md',
+        "html": f'{out_dir}/{base}.html',
+        "audio": f'{out_dir}/{base}.mp3',
+        # 回填产物的 feed 单独写在 out_dir 下，绝不改写仓库里已提交的线上 feed
+        "rss": profile['rss_file'] if out_dir == OUTPUT_DIR else f"{out_dir}/{os.path.basename(profile['rss_file'])}",
+        "report_archive": f'{ARCHIVE_DIR}/{base}.md',
+    }
+
+def public_urls(profile, run_date, out_dir=OUTPUT_DIR):
+    """返回 (音频直链, 网页地址)：优先 PUBLIC_BASE_URL 自托管，其次 GitHub；都没有时为空"""
+    paths = profile_paths(profile, run_date, out_dir)
+    base_url = os.getenv('PUBLIC_BASE_URL', '').rstrip('/')
+    if base_url:
+        return (f"{base_url}/{out_dir}/{os.path.basename(paths['audio'])}",
+                f"{base_url}/{out_dir}/{os.path.basename(paths['html'])}")
+    repo_slug = github_repo()
+    if '/' not in repo_slug:
+        return "", ""
+    user, repo = repo_slug.split('/')
+    audio_url = f"https://raw.githubusercontent.com/{repo_slug}/main/{out_dir}/{os.path.basename(paths['audio'])}"
+    page_url = f"https://{user}.github.io/{repo}/{out_dir}/{os.path.basename(paths['html'])}"
+    return audio_url, page_url
+
+_MODEL_SEMAPHORE = threading.BoundedSemaphore(MODEL_MAX_CONCURRENCY)
+_MODEL_RATE_LOCK = threading.Lock()
+_MODEL_LAST_CALL = 0.0
+
+@contextlib.contextmanager
+def model_slot():
+    """全局模型限流：并发不超过 MODEL_MAX_CONCURRENCY，相邻调用间隔不少于 MODEL_MIN_INTERVAL"""
+    global _MODEL_LAST_CALL
+    with _MODEL_SEMAPHORE:
+        with _MODEL_RATE_LOCK:
+            wait = _MODEL_LAST_CALL + MODEL_MIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            _MODEL_LAST_CALL = time.monotonic()
+        yield
+
+@functools.lru_cache(maxsize=None)
+def _load_dashscope():
+    """首次调用模型时才导入 DashScope SDK"""
+    import dashscope  # 阿里云百炼 SDK
+    # 🟢 打印 SDK 版本 (用于调试环境确保支持 Kimi 思考模式)
+    logger.info(f"🔍 当前 DashScope SDK 版本: {getattr(dashscope, '__version__', 'unknown')}")
+    dashscope.api_key = os.getenv('DASHSCOPE_API_KEY')
+    return dashscope
+
 # 🟢 2. 修复：_extract_text 函数 (核心修复)
 def _extract_text(response) -> str:
     """
@@ -359,7 +1137,7 @@ def _extract_text(response) -> str:
     return ""
 
 
-def call_qwen_structure(context):
+def call_qwen_structure(context, system_prompt):
     """
     Stage 1: Qwen3-Max (结构猎手)
     负责全网 80 条新闻的初筛和 Top 15 撰写 + Deep Dive 草稿。
@@ -367,18 +1145,20 @@ def call_qwen_structure(context):
     - 指数退避重试：最多 3 次，间隔 2/4/8 秒。
     """
     logger.info("🧠 [Stage 1] Qwen3-Max 正在构建骨架...")
-    dashscope.api_key = DASHSCOPE_API_KEY
+    _load_dashscope()
+    from dashscope import Generation
 
     for attempt in range(MAX_RETRIES):
         try:
-            response = Generation.call(
-                model='qwen3-max',
-                messages=[
-                    {'role': 'system', 'content': QWEN_PROMPT},
-                    {'role': 'user', 'content': f"今日情报素材池：\n{context}"}
-                ]
-                # ⚠️ 不传 enable_thinking：避免 thinking=False 时 output.text 为空的 SDK bug
-            )
+            with model_slot():
+                response = Generation.call(
+                    model='qwen3-max',
+                    messages=[
+                        {'role': 'system', 'content': system_prompt},
+                        {'role': 'user', 'content': f"今日情报素材池：\n{context}"}
+                    ]
+                    # ⚠️ 不传 enable_thinking：避免 thinking=False 时 output.text 为空的 SDK bug
+                )
             if response.status_code == HTTPStatus.OK:
                 text = _extract_text(response)
                 if text:
@@ -399,7 +1179,7 @@ def call_qwen_structure(context):
     logger.error("❌ [Stage 1] Qwen3-Max 重试耗尽，返回 None")
     return None
 
-def call_kimi_refine(draft_content):
+def call_kimi_refine(draft_content, system_prompt=KIMI_PROMPT, heading="Part 2: 深度搞钱逻辑 (Deep Dive)"):
     """
     Stage 2: kimi-k2.5 (深度智囊)
     接收 Qwen 的草稿，输出辛辣的"术语+大白话"深度分析。
@@ -410,10 +1190,11 @@ def call_kimi_refine(draft_content):
     - 指数退避重试：最多 3 次，间隔 2/4/8 秒。
     """
     logger.info("💎 [Stage 2] kimi-k2.5 正在深度锐化（思考模式开启）...")
-    dashscope.api_key = DASHSCOPE_API_KEY
+    _load_dashscope()
+    from dashscope import Generation, MultiModalConversation
 
     messages = [
-        {"role": "system", "content": KIMI_PROMPT},
+        {"role": "system", "content": system_prompt},
         {
             "role": "user",
             "content": [
@@ -428,16 +1209,17 @@ def call_kimi_refine(draft_content):
     # ── 主力：kimi-k2.5 ─────────────────────────────────
     for attempt in range(MAX_RETRIES):
         try:
-            response = MultiModalConversation.call(
-                model='kimi-k2.5',
-                messages=messages,
-                extra_body={"enable_thinking": True}
-            )
+            with model_slot():
+                response = MultiModalConversation.call(
+                    model='kimi-k2.5',
+                    messages=messages,
+                    extra_body={"enable_thinking": True}
+                )
             if response.status_code == HTTPStatus.OK:
                 result_text = _extract_text(response)
                 if result_text:
                     logger.info(f"✅ [Stage 2] kimi-k2.5 输出完成 ({len(result_text)} 字)")
-                    return f"### Part 2: 深度搞钱逻辑 (Deep Dive)\n\n{result_text}"
+                    return f"### {heading}\n\n{result_text}"
                 else:
                     logger.warning(f"[Stage 2] kimi-k2.5 返回空内容 (attempt {attempt+1}/{MAX_RETRIES})")
             else:
@@ -453,18 +1235,19 @@ def call_kimi_refine(draft_content):
     # ── 降级：qwen-plus ──────────────────────────────────
     logger.warning("⚠️ [Stage 2] kimi-k2.5 重试耗尽，降级使用 qwen-plus...")
     try:
-        fallback_resp = Generation.call(
-            model='qwen-plus',
-            messages=[
-                {"role": "system", "content": KIMI_PROMPT},
-                {"role": "user", "content": f"请参考范文风格，深度润色以下草稿：\n\n{draft_content}"}
-            ]
-        )
+        with model_slot():
+            fallback_resp = Generation.call(
+                model='qwen-plus',
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"请参考范文风格，深度润色以下草稿：\n\n{draft_content}"}
+                ]
+            )
         if fallback_resp.status_code == HTTPStatus.OK:
             text = _extract_text(fallback_resp)
             if text:
                 logger.info("✅ [Stage 2] qwen-plus 降级成功")
-                return f"### Part 2: 深度搞钱逻辑 (Deep Dive · qwen-plus 降级版)\n\n{text}"
+                return f"### {heading} · qwen-plus 降级版\n\n{text}"
         logger.error(f"[Stage 2] qwen-plus 降级失败: {fallback_resp.message}")
     except Exception as e:
         logger.error(f"[Stage 2] qwen-plus 降级异常: {e}")
@@ -472,17 +1255,23 @@ def call_kimi_refine(draft_content):
     logger.error("❌ [Stage 2] 所有模型失败，返回原始草稿")
     return f"### Part 2 (AI润色失败，原始草稿)\n\n{draft_content}"
 
-def dual_model_pipeline(news_items):
+def dual_model_pipeline(news_items, profile=None, run_date=None):
+    profile = profile or PROFILES['default']
+    display_date, display_weekday = profile_dates(profile, run_date or beijing_now())
     if not news_items:
-        return f"# J记财讯 · {DISPLAY_DATE}\n\n**⚠️ 今日无有效情报信号**"
+        return f"# {profile['title']} · {display_date}\n\n**⚠️ 今日无有效情报信号**"
 
-    # 1. 准备素材
+    # 1. 准备素材（本地话题聚类，只送代表条目；高分条目补全正文）
     context = ""
-    for i, item in enumerate(news_items[:80]):
-        context += f"{i+1}. [{item['source']}] (分:{item['score']}) {item['title']}\n摘要：{item['summary']}\n\n"
+    for i, item in enumerate(enrich_items(select_representatives(news_items))):
+        context += f"{i+1}. [{item.source}] (分:{item.score} 热:{item.heat}) {item.title}\n摘要：{item.summary}\n"
+        if item.content:
+            context += f"正文：{item.content}\n"
+        context += "\n"
 
     # 2. Qwen: 结构化 + 初筛
-    qwen_output = call_qwen_structure(context)
+    qwen_prompt = profile['qwen_prompt'].format(display_date=display_date, display_weekday=display_weekday)
+    qwen_output = call_qwen_structure(context, qwen_prompt)
     if not qwen_output:
         return "❌ 报告生成失败 (Qwen阶段)"
 
@@ -496,71 +1285,24 @@ def dual_model_pipeline(news_items):
         part2_draft = "（Qwen未正确输出分隔符，请查看原始日志）"
 
     # 4. Kimi: 深度润色 Part 2
-    part2_final = call_kimi_refine(part2_draft)
+    part2_final = call_kimi_refine(part2_draft, profile['kimi_prompt'], profile['part2_heading'])
 
     # 5. 组合
-    return f"# J记财讯 ({DISPLAY_DATE})\n\n{part1_top20}\n\n---\n\n{part2_final}"
+    return f"# {profile['title']} ({display_date})\n\n{part1_top20}\n\n---\n\n{part2_final}"
 
 # ================= 5. 生成交付物 =================
 
-def generate_rss(audio_url):
-    logger.info("📡 正在生成 RSS Feed...")
-
-    # 读取已有条目（追加模式，保留历史播客，播客客户端可订阅完整历史）
-    existing_items = []
-    if os.path.exists(RSS_FILE):
-        try:
-            tree = ET.parse(RSS_FILE)
-            root = tree.getroot()
-            channel = root.find('channel')
-            if channel is not None:
-                for item in channel.findall('item'):
-                    guid = item.findtext('guid', '')
-                    if guid != DATE_STR:  # 跳过今天的旧条目（本次重新写入）
-                        existing_items.append(ET.tostring(item, encoding='unicode'))
-        except Exception as e:
-            logger.warning(f"⚠️ 读取旧 RSS 失败（将重建）: {e}")
-
-    existing_items = existing_items[:29]  # 最多保留 30 天
-
-    today_item = f"""    <item>
-        <title>{DISPLAY_DATE} 情报内参</title>
-        <description>J记财讯每日更新 · {DISPLAY_WEEKDAY}</description>
-        <pubDate>{datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate>
-        <enclosure url="{audio_url}" type="audio/mpeg" length="100000"/>
-        <guid>{DATE_STR}</guid>
-    </item>"""
-
-    all_items_str = today_item + ("\n" + "\n".join(existing_items) if existing_items else "")
-
-    rss_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
-<channel>
-    <title>J记财讯</title>
-    <description>每日商业情报内参</description>
-    <link>https://github.com/{GITHUB_REPO}</link>
-    <lastBuildDate>{datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')}</lastBuildDate>
-{all_items_str}
-</channel>
-</rss>"""
-    with open(RSS_FILE, 'w', encoding='utf-8') as f:
-        f.write(rss_content)
-    logger.info(f"✅ RSS 已生成: {RSS_FILE}（共 {1 + len(existing_items)} 条）")
+TTS_RATE = "+10%"
+TTS_MAX_CHARS = 3500  # 20条内容更多，上限调至3500字
 
-async def generate_assets(content):
-    if not os.path.exists(OUTPUT_DIR): os.makedirs(OUTPUT_DIR)
-    
-    with open(MD_FILE, 'w', encoding='utf-8') as f: f.write(content)
-    logger.info(f"📄 MD 保存: {MD_FILE}")
-    
-    html_body = markdown.markdown(content)
-    html_template = f"""
+HTML_TEMPLATE = """
     <!DOCTYPE html>
-    <html lang="zh-CN">
+    <html lang="{lang}">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>J记财讯 {DISPLAY_DATE}</title>
+        <meta name="j-intel-render" content="{render_hash}">
+        <title>{title} {display_date}</title>
         <style>
             body {{ font-family: -apple-system, system-ui, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; background: #f2f2f7; color: #1c1c1e; }}
             .container {{ background: #fff; padding: 25px; border-radius: 16px; box-shadow: 0 4px 20px rgba(0,0,0,0.08); }}
@@ -576,12 +1318,12 @@ async def generate_assets(content):
     </head>
     <body>
         <div class="container">
-            <h1>🦁 J记财讯 · 商业内参</h1>
-            <div class="date">📅 {DISPLAY_DATE} {DISPLAY_WEEKDAY} | 📍 Beijing Time</div>
+            <h1>{masthead}</h1>
+            <div class="date">📅 {display_date} {display_weekday} | 📍 Beijing Time</div>
             
             <div style="background:#e5f1ff; padding:15px; border-radius:10px; margin-bottom:20px;">
-                <strong>🎧 语音播报：</strong>
-                <audio controls src="briefing_{DATE_STR}.mp3"></audio>
+                <strong>{audio_label}</strong>
+                <audio controls src="{audio_name}"></audio>
             </div>
             
             {html_body}
@@ -591,30 +1333,124 @@ async def generate_assets(content):
     </body>
     </html>
     """
-    with open(HTML_FILE, 'w', encoding='utf-8') as f: f.write(html_template)
-    logger.info(f"🌐 HTML 保存: {HTML_FILE}")
+
+def render_fingerprint(content, profile, run_date):
+    """渲染指纹：模板、音色、TTS 参数、日期显示或正文任一变化都会改变，回填据此跳过已是最新的日期"""
+    key = "\x00".join([HTML_TEMPLATE, TTS_RATE, str(TTS_MAX_CHARS), profile['voice'], profile['intro'],
+                       profile['masthead'], profile['audio_label'], profile['title'], profile['lang'],
+                       *profile_dates(profile, run_date), content])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def is_render_current(content, profile, run_date, out_dir=OUTPUT_DIR):
+    paths = profile_paths(profile, run_date, out_dir)
+    if not (os.path.exists(paths['html']) and os.path.exists(paths['audio'])):
+        return False
+    with open(paths['html'], encoding='utf-8') as f:
+        return f'<meta name="j-intel-render" content="{render_fingerprint(content, profile, run_date)}">' in f.read()
+
+def generate_rss(audio_url, profile=None, run_date=None, out_dir=OUTPUT_DIR):
+    profile = profile or PROFILES['default']
+    run_date = run_date or beijing_now()
+    date_str = run_date.strftime('%Y%m%d')
+    rss_file = profile_paths(profile, run_date, out_dir)['rss']
+    display_date, display_weekday = profile_dates(profile, run_date)
+    fields = dict(display_date=display_date, display_weekday=display_weekday, title=profile['title'])
+    logger.info(f"📡 正在生成 RSS Feed: {rss_file}")
+
+    # 读取已有条目（追加模式，保留历史播客，播客客户端可订阅完整历史）
+    existing_items = []  # (guid, xml)
+    if os.path.exists(rss_file):
+        try:
+            tree = ET.parse(rss_file)
+            root = tree.getroot()
+            channel = root.find('channel')
+            if channel is not None:
+                for item in channel.findall('item'):
+                    guid = item.findtext('guid', '')
+                    if guid != date_str:  # 跳过当天的旧条目（本次重新写入）
+                        existing_items.append((guid, ET.tostring(item, encoding='unicode')))
+        except Exception as e:
+            logger.warning(f"⚠️ 读取旧 RSS 失败（将重建）: {e}")
+
+    audio_file = profile_paths(profile, run_date, out_dir)['audio']
+    audio_length = os.path.getsize(audio_file) if os.path.exists(audio_file) else 100000
+    pub_date = run_date - timedelta(hours=8)  # 北京时间 → GMT
+
+    today_item = f"""    <item>
+        <title>{profile['episode_title'].format(**fields)}</title>
+        <description>{profile['episode_description'].format(**fields)}</description>
+        <pubDate>{pub_date.strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate>
+        <enclosure url="{audio_url}" type="audio/mpeg" length="{audio_length}"/>
+        <guid>{date_str}</guid>
+    </item>"""
+
+    # 按日期倒序排列（回填历史日期时插入到正确位置），最多保留 30 天
+    all_items = sorted(existing_items + [(date_str, today_item)], key=lambda x: x[0], reverse=True)[:30]
+    all_items_str = "\n".join(xml for _, xml in all_items)
+
+    rss_content = f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+<channel>
+    <title>{profile['title']}</title>
+    <description>{profile['feed_description']}</description>
+    <link>https://github.com/{github_repo()}</link>
+    <lastBuildDate>{datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')}</lastBuildDate>
+{all_items_str}
+</channel>
+</rss>"""
+    with open(rss_file, 'w', encoding='utf-8') as f:
+        f.write(rss_content)
+    logger.info(f"✅ RSS 已生成: {rss_file}（共 {len(all_items)} 条）")
+
+async def generate_assets(content, profile=None, run_date=None, out_dir=OUTPUT_DIR):
+    import markdown
+    import edge_tts
+
+    profile = profile or PROFILES['default']
+    run_date = run_date or beijing_now()
+    paths = profile_paths(profile, run_date, out_dir)
+    display_date, display_weekday = profile_dates(profile, run_date)
+    render_hash = render_fingerprint(content, profile, run_date)
+    if not os.path.exists(out_dir): os.makedirs(out_dir, exist_ok=True)
+    
+    with open(paths['md'], 'w', encoding='utf-8') as f: f.write(content)
+    logger.info(f"📄 MD 保存: {paths['md']}")
+    
+    html_body = markdown.markdown(content)
+    html_template = HTML_TEMPLATE.format(
+        lang=profile['lang'], title=profile['title'], display_date=display_date,
+        masthead=profile['masthead'].format(title=profile['title']), audio_label=profile['audio_label'],
+        display_weekday=display_weekday, audio_name=os.path.basename(paths['audio']),
+        html_body=html_body, render_hash=render_hash)
     
     tts_text = clean_text_for_tts(content)
-    intro = f"今天是{DISPLAY_DATE}，{DISPLAY_WEEKDAY}。欢迎收听J记财讯。\n\n"
-    final_tts_text = intro + tts_text[:3500]  # 20条内容更多，上限调至3500字
+    intro = profile['intro'].format(display_date=display_date, display_weekday=display_weekday, title=profile['title'])
+    final_tts_text = intro + tts_text[:TTS_MAX_CHARS]
     
-    communicate = edge_tts.Communicate(final_tts_text, "zh-CN-YunxiNeural", rate="+10%")
-    await communicate.save(AUDIO_FILE)
-    logger.info(f"🎙️ MP3 保存: {AUDIO_FILE}")
+    communicate = edge_tts.Communicate(final_tts_text, profile['voice'], rate=TTS_RATE)
+    await communicate.save(paths['audio'])
+    logger.info(f"🎙️ MP3 保存: {paths['audio']}")
+
+    # HTML 带渲染指纹，最后写入：TTS 失败时不会把旧 MP3 误判为最新
+    with open(paths['html'], 'w', encoding='utf-8') as f: f.write(html_template)
+    logger.info(f"🌐 HTML 保存: {paths['html']}")
     
-    return [MD_FILE, HTML_FILE, AUDIO_FILE]
+    return [paths['md'], paths['html'], paths['audio']]
 
 # ================= 6. 云端归档与清理 =================
 
-def upload_and_cleanup(files):
-    if ALIYUN_TOKEN:
+def upload_files(files, folder=ALIYUN_FOLDER):
+    aliyun_token = os.getenv('ALIYUN_REFRESH_TOKEN')
+    if aliyun_token:
         try:
+            from aligo import Aligo
+
             logger.info("☁️ 连接阿里云盘...")
-            ali = Aligo(level=logging.ERROR, refresh_token=ALIYUN_TOKEN)
-            remote_folder = ali.get_folder_by_path('/晨间情报')
+            ali = Aligo(level=logging.ERROR, refresh_token=aliyun_token)
+            remote_folder = ali.get_folder_by_path(folder)
             if not remote_folder:
-                ali.create_folder('/晨间情报')
-                remote_folder = ali.get_folder_by_path('/晨间情报')
+                ali.create_folder(folder)
+                remote_folder = ali.get_folder_by_path(folder)
             
             for f in files:
                 ali.upload_file(f, remote_folder.file_id)
@@ -625,8 +1461,9 @@ def upload_and_cleanup(files):
     else:
         logger.warning("⚠️ 未配置 ALIYUN_REFRESH_TOKEN，跳过上传")
 
+def cleanup_outputs(run_date):
     logger.info("🧹 执行本地清理 (保留3天)...")
-    cutoff_date = BEIJING_NOW - timedelta(days=3)
+    cutoff_date = run_date - timedelta(days=3)
     cutoff_str = cutoff_date.strftime('%Y%m%d')
     for f in glob.glob(os.path.join(OUTPUT_DIR, '*')):
         filename = os.path.basename(f)
@@ -639,14 +1476,36 @@ def upload_and_cleanup(files):
                     logger.info(f"   🗑️ 删除旧文件: {filename}")
                 except: pass
 
+def cleanup_archive(run_date):
+    """归档只在仓库里保留 ARCHIVE_RETENTION_DAYS 天（workflow 的 git add . 会提交它），更早的只留在云盘"""
+    cutoff_str = (run_date - timedelta(days=ARCHIVE_RETENTION_DAYS)).strftime('%Y%m%d')
+    for f in glob.glob(os.path.join(ARCHIVE_DIR, '*')):
+        match = re.search(r'(\d{8})', os.path.basename(f))
+        if match and match.group(1) < cutoff_str:
+            try:
+                os.remove(f)
+                logger.info(f"   🗑️ 删除过期归档: {os.path.basename(f)}")
+            except: pass
+
+def upload_and_cleanup(files, run_date=None, archive_files=()):
+    run_date = run_date or beijing_now()
+    upload_files(files)
+    if archive_files:
+        upload_files(archive_files, ALIYUN_ARCHIVE_FOLDER)
+    cleanup_outputs(run_date)
+    cleanup_archive(run_date)
+
 def send_bark_notification(title, body, url=None):
-    if not BARK_KEY:
+    bark_key = os.getenv('BARK_KEY')
+    if not bark_key:
         logger.warning("⚠️ 未配置 BARK_KEY，跳过推送")
         return
     
     try:
+        import requests
+
         safe_body = body.replace('\n', ' ')[:100] + "..."
-        api_url = f"https://api.day.app/{BARK_KEY}/{title}/{safe_body}"
+        api_url = f"https://api.day.app/{bark_key}/{title}/{safe_body}"
         params = {
             'group': 'J-Intel',
             'icon': 'https://cdn-icons-png.flaticon.com/512/2965/2965363.png'
@@ -659,39 +1518,490 @@ def send_bark_notification(title, body, url=None):
     except Exception as e:
         logger.error(f"❌ Bark 推送失败: {e}")
 
+# ================= 7. 归档与历史回填 (Backfill) =================
+# 每次晨跑把共享原始素材和各版本 LLM 输出归档到 data/archive，
+# 回填时优先复用 LLM 输出（模板/音色变更只需重新渲染），没有则从原始素材重跑 LLM。
+
+def raw_archive_path(run_date):
+    return f"{ARCHIVE_DIR}/raw_{run_date.strftime('%Y%m%d')}.jsonl.gz"
+
+def archive_raw_items(items, run_date):
+    """边归档边转发：每条原始素材写一行 JSON（jsonl.gz）后原样产出，全部写完才落盘为正式文件"""
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    path = raw_archive_path(run_date)
+    count = 0
+    with gzip.open(path + '.tmp', 'wt', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item.to_record(), ensure_ascii=False) + '\n')
+            count += 1
+            yield item
+    os.replace(path + '.tmp', path)
+    logger.info(f"🗄️ 原始素材归档: {path}（{count} 条）")
+
+def _iter_raw_archive(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        if path.endswith('.jsonl.gz'):
+            for line in f:
+                yield Item(**json.loads(line))
+        else:  # 早期归档是整个 JSON 数组
+            for record in json.load(f):
+                yield Item(**record)
+
+def load_raw_archive(run_date):
+    """逐条读取某日的原始素材归档；没有归档返回 None"""
+    path = raw_archive_path(run_date)
+    for path in (path, path.replace('.jsonl.gz', '.json.gz')):
+        if os.path.exists(path):
+            return _iter_raw_archive(path)
+    return None
+
+def archive_report(content, profile, run_date):
+    if content.startswith("❌"):  # 生成失败的占位文本不归档，回填时会重跑
+        return
+    path = profile_paths(profile, run_date)['report_archive']
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def load_report_archive(profile, run_date):
+    path = profile_paths(profile, run_date)['report_archive']
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+def backfill_day(profile, run_date, refresh_llm=False, force=False):
+    """
+    回填单个版本的单日简报（写入 BACKFILL_DIR），返回生成的文件列表；已是最新或缺少素材时返回 None。
+    不写 output/：晨跑的 cleanup_outputs 只保留 3 天，回填的历史第二天就会被删掉。
+    """
+    tag = f"[{profile['name']} {run_date.strftime('%Y%m%d')}]"
+    content = None if refresh_llm else load_report_archive(profile, run_date)
+    if content is None:
+        raw_items = load_raw_archive(run_date)
+        if raw_items is None:
+            logger.warning(f"⚠️ {tag} 无归档素材，跳过（超过 {ARCHIVE_RETENTION_DAYS} 天的归档需先从云盘 {ALIYUN_ARCHIVE_FOLDER} 放回 {ARCHIVE_DIR}）")
+            return None
+        content = dual_model_pipeline(score_items(raw_items, profile), profile, run_date)
+        if content.startswith("❌"):
+            raise RuntimeError(content)
+        archive_report(content, profile, run_date)
+
+    if not force and is_render_current(content, profile, run_date, BACKFILL_DIR):
+        logger.info(f"⏭️ {tag} 产物已是最新，跳过")
+        return None
+    return asyncio.run(generate_assets(content, profile, run_date, BACKFILL_DIR))
+
+def run_backfill(start, end, profile_names=("default",), workers=4, refresh_llm=False, force=False, upload=True):
+    profiles = [PROFILES[name] for name in profile_names]
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    logger.info(f"🔁 回填 {start.strftime('%Y%m%d')} → {end.strftime('%Y%m%d')}：{len(days)} 天 × {len(profiles)} 个版本")
+
+    rendered = []  # (run_date, profile, files)
+    failed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(backfill_day, profile, day, refresh_llm, force): (day, profile)
+                   for day in days for profile in profiles}
+        for future in concurrent.futures.as_completed(futures):
+            day, profile = futures[future]
+            try:
+                files = future.result()
+                if files:
+                    rendered.append((day, profile, files))
+            except Exception as e:
+                failed += 1
+                logger.error(f"❌ [{profile['name']} {day.strftime('%Y%m%d')}] 回填失败: {e}")
+
+    # RSS 串行写入，避免多个线程同时改写同一个 feed 文件。
+    # 回填 feed 写到 backfill/ 下（不动线上 feed）；backfill/ 不进 git，只有自托管 serve 能对外提供，
+    # 没配置 PUBLIC_BASE_URL 时其中的链接无法访问，干脆不写
+    if os.getenv('PUBLIC_BASE_URL'):
+        for day, profile, _ in sorted(rendered, key=lambda x: x[0]):
+            generate_rss(public_urls(profile, day, BACKFILL_DIR)[0], profile, day, BACKFILL_DIR)
+    elif rendered:
+        logger.info(f"ℹ️ 未设置 PUBLIC_BASE_URL，跳过回填 feed（{BACKFILL_DIR}/ 仅由 serve 对外提供）")
+    if upload:
+        upload_files([f for _, _, files in rendered for f in files])
+
+    logger.info(f"🎉 回填完成：重新生成 {len(rendered)} 份，失败 {failed} 份")
+    if failed:
+        raise RuntimeError(f"{failed} 份回填失败")
+
+# ================= 8. 自托管服务 (serve) =================
+# 直接在自己的机器上提供 output/、feed*.xml 和 data/archive：
+# 强 ETag + Last-Modified（播客客户端轮询命中 304 几乎零成本），HTML/XML 预压缩 gzip/brotli，
+# MP3 支持 Range 请求并通过 sendfile 零拷贝发送（拖动进度条不必整段下载）。
+
+SERVE_HOST = '0.0.0.0'
+SERVE_PORT = 8080
+SERVE_IDLE_TIMEOUT = 15      # keep-alive 连接空闲超时（秒）；读取整个请求头也必须在这个时间内完成
+SERVE_MAX_HEADERS = 100      # 单个请求最多多少行请求头
+SERVE_MAX_HEADER_BYTES = 16 * 1024
+SERVE_CACHE_SWEEP = 600      # 每 10 分钟清掉已被 cleanup 删除的文件的缓存（含压缩副本）
+COMPRESSIBLE_TYPES = ('text/', 'application/rss+xml', 'application/xml', 'application/json')
+CONTENT_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.html': 'text/html; charset=utf-8',
+    '.md': 'text/markdown; charset=utf-8',
+    '.xml': 'application/rss+xml; charset=utf-8',
+    '.json': 'application/json',
+    '.gz': 'application/gzip',
+}
+
+_STATIC_CACHE = {}   # path -> 静态文件元数据（mtime/size 变化时重建）
+
+def _static_entry(path):
+    """文件元数据：强 ETag（内容哈希）、Last-Modified，以及文本类文件的 gzip/brotli 预压缩副本"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        _STATIC_CACHE.pop(path, None)  # 文件已被删除：连同压缩副本一起丢掉
+        raise
+    cached = _STATIC_CACHE.get(path)
+    if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+        return cached
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    content_type = CONTENT_TYPES.get(os.path.splitext(path)[1], 'application/octet-stream')
+    entry = {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'etag': f'"{digest.hexdigest()[:20]}"',
+        'last_modified': formatdate(stat.st_mtime, usegmt=True),
+        'mtime': int(stat.st_mtime),
+        'content_type': content_type,
+        'encoded': {},   # encoding -> bytes
+    }
+    if content_type.startswith(COMPRESSIBLE_TYPES):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        entry['encoded']['gzip'] = gzip.compress(raw, compresslevel=9, mtime=0)
+        try:
+            import brotli
+            entry['encoded']['br'] = brotli.compress(raw)
+        except ImportError:
+            pass
+    _STATIC_CACHE[path] = entry
+    return entry
+
+def _prune_static_cache():
+    """丢掉已不存在的文件的缓存：cleanup_outputs/cleanup_archive 删掉的文件不会再被请求到"""
+    for path in [p for p in _STATIC_CACHE if not os.path.isfile(p)]:
+        _STATIC_CACHE.pop(path, None)
+
+def _resolve_static(url_path):
+    """URL → 本地文件；只允许 output/、backfill/、data/archive/ 和根目录下各版本的 feed 文件"""
+    url_path = unquote(urlsplit(url_path).path)
+    feed_files = {os.path.basename(p['rss_file']) for p in PROFILES.values()}
+    if url_path.lstrip('/') in feed_files:
+        path = url_path.lstrip('/')
+        return path if os.path.isfile(path) else None  # 版本 feed 尚未生成时返回 404
+    for prefix, base_dir in (('/output/', OUTPUT_DIR), ('/backfill/', BACKFILL_DIR), ('/archive/', ARCHIVE_DIR)):
+        if url_path.startswith(prefix):
+            base = os.path.realpath(base_dir)
+            path = os.path.realpath(os.path.join(base, url_path[len(prefix):]))
+            if path.startswith(base + os.sep) and os.path.isfile(path):
+                return path
+    return None
+
+def _parse_range(header, size):
+    """解析单段 Range: bytes=a-b / a- / -n，返回 (start, end) 闭区间；不支持的格式返回 None，越界返回 False"""
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    if size == 0:
+        return False
+    start, end = match.groups()
+    if start == '':
+        length = int(end)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+def _not_modified(headers, entry):
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = {t.strip() for t in if_none_match.split(',')}
+        variants = {entry['etag']} | {entry['etag'][:-1] + f'-{enc}"' for enc in entry['encoded']}
+        return '*' in tags or bool(tags & variants)
+    if_modified_since = headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            return entry['mtime'] <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+async def _send_response(writer, status, headers, body=b''):
+    reason = HTTPStatus(status).phrase
+    lines = [f"HTTP/1.1 {status} {reason}"] + [f"{k}: {v}" for k, v in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+    await writer.drain()
+
+async def _send_not_found(writer):
+    await _send_response(writer, 404, {'Content-Type': 'text/plain; charset=utf-8', 'Content-Length': 9}, b'Not Found')
+
+async def _read_headers(reader):
+    """读取请求头；行数或总字节数超限返回 None"""
+    headers = {}
+    total = 0
+    for _ in range(SERVE_MAX_HEADERS + 1):
+        try:
+            line = await reader.readline()
+        except ValueError:  # 单行超过 StreamReader 的缓冲上限
+            return None
+        total += len(line)
+        if total > SERVE_MAX_HEADER_BYTES:
+            return None
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+    return None
+
+async def _serve_static(writer, method, target, headers):
+    path = None
+    if target == '/':
+        pages = sorted(glob.glob(os.path.join(OUTPUT_DIR, f"{PROFILES['default']['prefix']}_*.html")))
+        if pages:
+            await _send_response(writer, 302, {'Location': f"/output/{os.path.basename(pages[-1])}", 'Content-Length': 0})
+            return
+    else:
+        path = _resolve_static(target)
+    if path is None:
+        await _send_not_found(writer)
+        return
+
+    try:
+        entry = await asyncio.to_thread(_static_entry, path)  # 首次访问要算哈希/压缩，放到线程里
+    except FileNotFoundError:  # 解析后、读取前被清理掉了
+        await _send_not_found(writer)
+        return
+    common = {
+        'Last-Modified': entry['last_modified'],
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': 'public, max-age=86400' if entry['content_type'] == 'audio/mpeg' else 'no-cache',
+    }
+    if entry['encoded']:
+        common['Vary'] = 'Accept-Encoding'
+
+    accepted = {e.split(';')[0].strip() for e in headers.get('accept-encoding', '').split(',')}
+    encoding = next((enc for enc in ('br', 'gzip') if enc in accepted and enc in entry['encoded']), None)
+    etag = entry['etag'][:-1] + f'-{encoding}"' if encoding else entry['etag']
+    common['ETag'] = etag
+
+    if _not_modified(headers, entry):
+        await _send_response(writer, 304, common)
+        return
+
+    if encoding:
+        body = entry['encoded'][encoding]
+        headers_out = {**common, 'Content-Type': entry['content_type'], 'Content-Encoding': encoding,
+                       'Content-Length': len(body)}
+        await _send_response(writer, 200, headers_out, b'' if method == 'HEAD' else body)
+        return
+
+    size = entry['size']
+    start, end, status = 0, size - 1, 200
+    range_header = headers.get('range')
+    if_range = headers.get('if-range')
+    if range_header and (if_range is None or if_range in (entry['etag'], entry['last_modified'])):
+        parsed = _parse_range(range_header, size)
+        if parsed is False:
+            await _send_response(writer, 416, {**common, 'Content-Range': f'bytes */{size}', 'Content-Length': 0})
+            return
+        if parsed:
+            (start, end), status = parsed, 206
+            common['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    length = end - start + 1 if size else 0
+    await _send_response(writer, status, {**common, 'Content-Type': entry['content_type'], 'Content-Length': length})
+    if method == 'GET' and length:
+        with open(path, 'rb') as f:
+            # loop.sendfile 在支持的平台上走 os.sendfile 零拷贝，否则自动退化为分块读写
+            await asyncio.get_running_loop().sendfile(writer.transport, f, start, length)
+
+async def _handle_connection(reader, writer):
+    try:
+        while True:
+            try:
+                request_line = await asyncio.wait_for(reader.readline(), SERVE_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                break
+            if not request_line:
+                break
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                await _send_response(writer, 400, {'Content-Length': 0, 'Connection': 'close'})
+                break
+            method, target, version = parts
+            try:
+                # 整个请求头共用一个超时：慢速逐行发送请求头的客户端不能无限期占住连接
+                headers = await asyncio.wait_for(_read_headers(reader), SERVE_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                break
+            if headers is None:
+                await _send_response(writer, 431, {'Content-Length': 0, 'Connection': 'close'})
+                break
+
+            if method not in ('GET', 'HEAD'):
+                await _send_response(writer, 405, {'Allow': 'GET, HEAD', 'Content-Length': 0})
+            else:
+                await _serve_static(writer, method, target, headers)
+
+            connection = headers.get('connection', '').lower()
+            if connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive'):
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    except Exception as e:
+        logger.warning(f"⚠️ 请求处理异常: {e}")
+    finally:
+        writer.close()
+
+def _warm_static_cache():
+    """启动时预先计算 ETag 和压缩副本，第一次请求也不用现算"""
+    paths = [p['rss_file'] for p in PROFILES.values() if os.path.exists(p['rss_file'])]
+    for base_dir in (OUTPUT_DIR, BACKFILL_DIR, ARCHIVE_DIR):
+        paths += [os.path.realpath(p) for p in glob.glob(os.path.join(base_dir, '*'))]  # 与 _resolve_static 的键一致
+    for path in paths:
+        if os.path.isfile(path):
+            _static_entry(path)
+    logger.info(f"🗜️ 已预计算 {len(paths)} 个文件的 ETag/压缩副本")
+
+async def _sweep_static_cache():
+    while True:
+        await asyncio.sleep(SERVE_CACHE_SWEEP)
+        _prune_static_cache()
+
+async def serve(host=SERVE_HOST, port=SERVE_PORT):
+    await asyncio.to_thread(_warm_static_cache)
+    server = await asyncio.start_server(_handle_connection, host, port)
+    sweeper = asyncio.create_task(_sweep_static_cache())
+    logger.info(f"🌍 J记财讯服务已启动: http://{host}:{port}/ (feed: /{RSS_FILE})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+
 # ================= 主程序入口 =================
 
-if __name__ == "__main__":
-    # 1. 采集
-    news_data = fetch_all_data()
-    
+def run_profile(profile, news_data, run_date):
+    """单个版本：双模型 → 文件 → RSS（news_data 为该版本评分后的 Top-K），返回生成的文件列表"""
+    name = profile['name']
+    logger.info(f"📰 [{name}] 开始生成 {profile['title']}")
+
     # 2. 分析 (双模型)
-    report_content = dual_model_pipeline(news_data)
+    report_content = dual_model_pipeline(news_data, profile, run_date)
+    archive_report(report_content, profile, run_date)
     
     # 3. 生成文件
-    generated_files = asyncio.run(generate_assets(report_content))
+    generated_files = asyncio.run(generate_assets(report_content, profile, run_date))
     
     # 4. 生成 RSS
-    if '/' in GITHUB_REPO:
-        audio_url = f"https://raw.githubusercontent.com/{GITHUB_REPO}/main/{OUTPUT_DIR}/briefing_{DATE_STR}.mp3"
-    else:
-        audio_url = ""
-    generate_rss(audio_url)
+    audio_url, _ = public_urls(profile, run_date)
+    generate_rss(audio_url, profile, run_date)
+    return generated_files
+
+def run_daily(profile_names=("default",), run_date=None, store=ITEM_STORE):
+    profiles = [PROFILES[name] for name in profile_names]
+    run_date = run_date or beijing_now()
+
+    # 1. 采集（所有版本共享一次）并归档供日后回填；条目逐条流过，各版本各自评分进 Top-K 堆
+    tops = {profile['name']: TopK(CLUSTER_POOL) for profile in profiles}
+    for item in archive_raw_items(collect_items(store), run_date):
+        for profile in profiles:
+            scored = score_item(item, profile)
+            if scored is not None:
+                tops[profile['name']].push(scored)
+    news_data = {profile['name']: _finish_top_k(tops[profile['name']], profile) for profile in profiles}
+
+    # 2-4. 各版本并行（有界并发）
+    generated_files = []
+    done_profiles = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=PROFILE_CONCURRENCY) as executor:
+        futures = {executor.submit(run_profile, profile, news_data[profile['name']], run_date): profile for profile in profiles}
+        for future in concurrent.futures.as_completed(futures):
+            profile = futures[future]
+            try:
+                generated_files.extend(future.result())
+                done_profiles.append(profile)
+            except Exception as e:
+                logger.error(f"❌ [{profile['name']}] 版本生成失败: {e}")
     
-    # 5. 备份与清理
-    upload_and_cleanup(generated_files)
+    # 5. 备份与清理（归档另传一份到云盘，仓库里只保留最近 ARCHIVE_RETENTION_DAYS 天）
+    archive_files = [raw_archive_path(run_date)] + [profile_paths(p, run_date)['report_archive'] for p in profiles]
+    upload_and_cleanup(generated_files, run_date, [f for f in archive_files if os.path.exists(f)])
     
     # 6. 发送 Bark 推送
-    if '/' in GITHUB_REPO:
-        user, repo = GITHUB_REPO.split('/')
-        page_url = f"https://{user}.github.io/{repo}/{OUTPUT_DIR}/briefing_{DATE_STR}.html"
-    else:
-        page_url = ""
+    for profile in done_profiles:
+        _, page_url = public_urls(profile, run_date)
+        send_bark_notification(
+            f"{profile['title']} ({profile_dates(profile, run_date)[0]})",
+            profile['notify_body'],
+            url=page_url
+        )
 
-    send_bark_notification(
-        f"J记财讯 ({DISPLAY_DATE})",
-        "今日商业情报已生成(Qwen+Kimi)，点击查看详情。",
-        url=page_url
-    )
-    
+    if len(done_profiles) < len(profiles):
+        raise RuntimeError(f"{len(profiles) - len(done_profiles)} 个版本生成失败")
     logger.info("🎉 J记财讯任务圆满完成")
+
+def _parse_date(value):
+    # 回填日期按当天 06:30 (北京时间) 的晨跑时刻处理
+    return datetime.strptime(value, '%Y%m%d').replace(hour=6, minute=30)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="J记财讯 晨间情报")
+    subparsers = parser.add_subparsers(dest='command')
+    run_parser = subparsers.add_parser('run', help='生成今日简报（默认）')
+    run_parser.add_argument('--profiles', default='default',
+                            help=f"逗号分隔的版本名，或 all（可选: {', '.join(PROFILES)}）")
+    run_parser.add_argument('--store', default=ITEM_STORE, help='常驻采集库路径（与 ingest --store 一致）')
+    ingest_parser = subparsers.add_parser('ingest', help='常驻采集：按信源间隔轮询入库')
+    ingest_parser.add_argument('--store', default=ITEM_STORE, help='情报库路径')
+    ingest_parser.add_argument('--once', action='store_true', help='只轮询一轮后退出')
+    backfill_parser = subparsers.add_parser('backfill', help='按日期范围回填/重新渲染历史简报')
+    backfill_parser.add_argument('--start', required=True, type=_parse_date, help='起始日期 YYYYMMDD')
+    backfill_parser.add_argument('--end', type=_parse_date, help='结束日期 YYYYMMDD（默认同起始日期）')
+    backfill_parser.add_argument('--profiles', default='default', help='同 run --profiles')
+    backfill_parser.add_argument('--workers', type=int, default=4, help='并行天数')
+    backfill_parser.add_argument('--refresh-llm', action='store_true', help='忽略已归档的 LLM 输出，从原始素材重跑')
+    backfill_parser.add_argument('--force', action='store_true', help='即使产物已是最新也重新渲染')
+    backfill_parser.add_argument('--no-upload', dest='upload', action='store_false',
+                                 help=f'回填完成后不上传到阿里云盘（默认上传；本地产物保留在 {BACKFILL_DIR}/）')
+    serve_parser = subparsers.add_parser('serve', help='自托管 HTTP 服务：简报、音频与 feed')
+    serve_parser.add_argument('--host', default=SERVE_HOST)
+    serve_parser.add_argument('--port', type=int, default=SERVE_PORT)
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    if args.command == 'ingest':
+        run_ingest_daemon(args.store, once=args.once)
+        return
+    if args.command == 'serve':
+        asyncio.run(serve(args.host, args.port))
+        return
+
+    profiles = getattr(args, 'profiles', 'default')
+    names = list(PROFILES) if profiles == 'all' else [p.strip() for p in profiles.split(',') if p.strip()]
+    unknown = [n for n in names if n not in PROFILES]
+    if unknown:
+        parser.error(f"未知版本: {', '.join(unknown)}")
+
+    if args.command == 'backfill':
+        run_backfill(args.start, args.end or args.start, names, args.workers,
+                     refresh_llm=args.refresh_llm, force=args.force, upload=args.upload)
+    else:
+        run_daily(names, store=getattr(args, 'store', ITEM_STORE))
+
+if __name__ == "__main__":
+    main()